@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+"""
+Сравнение интерпретируемого и скомпилированного сопоставления правил.
+
+Запуск: python benchmark_matching.py [число_правил ...]
+"""
+
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from inference_engine import InferenceEngine
+from knowledge_base import KnowledgeBase, Rule
+from rule_compiler import CompiledMatcher
+from working_memory import WorkingMemory
+
+
+def synthetic_knowledge_base(rule_count: int, seed: int = 0) -> Tuple[KnowledgeBase, List[str]]:
+    """
+    Случайная база знаний и исходные факты.
+
+    Условия (от одного до четырёх) и заключения выбираются из rule_count фактов;
+    исходными объявляется 0.5% фактов, так что срабатывает лишь часть правил.
+    """
+    rng = random.Random(seed)
+    rules = [
+        Rule(
+            id=f"R{index + 1}",
+            conditions=tuple(f"Факт {rng.randrange(rule_count)}" for _ in range(rng.randint(1, 4))),
+            conclusion=f"Факт {rng.randrange(rule_count)}",
+        )
+        for index in range(rule_count)
+    ]
+    initial = [f"Факт {index}" for index in rng.sample(range(rule_count), max(1, rule_count // 200))]
+    return KnowledgeBase(rules), initial
+
+
+def make_memory(facts: List[str]) -> WorkingMemory:
+    wm = WorkingMemory()
+    for fact in facts:
+        wm.add_fact(fact, "user")
+    return wm
+
+
+def best_time(function, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"{'правил':>8}{'компиляция, с':>15}{'сопост. интерп., мс':>21}{'сопост. компил., мс':>21}"
+          f"{'ускорение':>11}{'срабатываний':>14}{'вывод интерп., с':>18}{'вывод компил., с':>18}")
+    for size in sizes:
+        kb, initial = synthetic_knowledge_base(size)
+        start = time.perf_counter()
+        CompiledMatcher(kb)
+        compile_time = time.perf_counter() - start
+
+        interpreted = InferenceEngine(kb, matcher="interpreted")
+        compiled = InferenceEngine(kb, matcher="compiled")
+        wm = make_memory(initial)
+        match_interpreted = best_time(lambda: interpreted._collect_conflict_set(wm))
+        match_compiled = best_time(lambda: compiled._collect_conflict_set(wm))
+
+        results = {}
+        for name, engine in (("interpreted", interpreted), ("compiled", compiled)):
+            memory = make_memory(initial)
+            start = time.perf_counter()
+            applied = engine.infer(memory, strategy="recency")
+            results[name] = (time.perf_counter() - start, [item.rule.id for item in applied])
+        if results["interpreted"][1] != results["compiled"][1]:
+            raise AssertionError("Порядок срабатывания правил различается.")
+
+        print(f"{size:>8}{compile_time:>15.2f}{match_interpreted * 1000:>21.2f}{match_compiled * 1000:>21.2f}"
+              f"{match_interpreted / match_compiled:>10.1f}×{len(results['compiled'][1]):>14}"
+              f"{results['interpreted'][0]:>18.2f}{results['compiled'][0]:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
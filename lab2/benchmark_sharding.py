@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+"""
+Сравнение последовательного и распределённого по процессам сопоставления правил.
+
+Запуск: python benchmark_sharding.py [число_правил] [число_процессов ...]
+"""
+
+import os
+import sys
+import time
+
+from benchmark_matching import make_memory, synthetic_knowledge_base
+from inference_engine import InferenceEngine
+
+
+STRATEGIES = ("order", "specificity", "recency")
+
+
+def run(engine: InferenceEngine, initial, strategy: str):
+    memory = make_memory(initial)
+    start = time.perf_counter()
+    applied = engine.infer(memory, strategy=strategy)
+    return time.perf_counter() - start, [item.rule.id for item in applied]
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    worker_counts = [int(count) for count in sys.argv[2:]] or [1, 2, 4]
+    kb, initial = synthetic_knowledge_base(size)
+    print(f"Правил: {size}, ядер: {os.cpu_count()}")
+    print(f"{'режим':<22}{'запуск, с':>11}" + "".join(f"{strategy + ', с':>15}" for strategy in STRATEGIES))
+
+    modes = [("interpreted", None), ("compiled", None)] + [("sharded", workers) for workers in worker_counts]
+    reference = None
+    for mode, workers in modes:
+        start = time.perf_counter()
+        engine = InferenceEngine(kb, matcher=mode, workers=workers)
+        # Первый вызов дожидается, пока работники построят свои части
+        engine.infer(make_memory([]))
+        startup = time.perf_counter() - start
+        try:
+            results = {strategy: run(engine, initial, strategy) for strategy in STRATEGIES}
+        finally:
+            engine.close()
+
+        order = {strategy: ids for strategy, (_, ids) in results.items()}
+        if reference is None:
+            reference = order
+        elif order != reference:
+            raise AssertionError(f"Порядок срабатывания правил различается: {mode}, {workers} проц.")
+        name = mode if workers is None else f"{mode}, {workers} проц."
+        print(f"{name:<22}{startup:>11.2f}" + "".join(f"{results[s][0]:>15.2f}" for s in STRATEGIES))
+
+    print("Срабатываний: " + ", ".join(f"{s}: {len(reference[s])}" for s in STRATEGIES))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,18 @@ from __future__ import annotations
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Sequence
+from typing import Dict, List, Optional, Sequence
 
 from knowledge_base import KnowledgeBase, Rule
+from rule_compiler import compile_knowledge_base
+from sharded_matcher import ShardedMatcher
 from working_memory import WorkingMemory
 
 
 ConflictStrategy = str
+MatcherMode = str
+
+MATCHER_MODES = ("interpreted", "compiled", "sharded")
 
 
 @dataclass
@@ -25,8 +30,31 @@ class AppliedRule:
 class InferenceEngine:
     """Реализует прямой вывод с несколькими стратегиями разрешения конфликтов."""
 
-    def __init__(self, knowledge_base: KnowledgeBase) -> None:
+    def __init__(
+        self,
+        knowledge_base: KnowledgeBase,
+        matcher: MatcherMode = "interpreted",
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        Поддерживаются режимы сопоставления правил:
+        - interpreted: условия правил проверяются в цикле по базе знаний;
+        - compiled: база знаний компилируется в код Python (см. rule_compiler);
+        - sharded: правила делятся между workers процессами (см. sharded_matcher),
+          процессы освобождаются методом close().
+        """
+        matcher = matcher.lower()
+        if matcher not in MATCHER_MODES:
+            raise ValueError(f"Неизвестный режим сопоставления правил: {matcher}")
         self._kb = knowledge_base
+        self._compiled = compile_knowledge_base(knowledge_base) if matcher == "compiled" else None
+        self._sharded = ShardedMatcher(knowledge_base, workers) if matcher == "sharded" else None
+
+    def close(self) -> None:
+        """Освобождает процессы параллельного сопоставления."""
+        if self._sharded is not None:
+            self._sharded.close()
+            self._sharded = None
 
     def infer(self, working_memory: WorkingMemory, strategy: ConflictStrategy = "order") -> List[AppliedRule]:
         """
@@ -38,7 +66,7 @@ class InferenceEngine:
         iteration = 0
 
         while True:
-            conflict_set = self._collect_conflict_set(working_memory)
+            conflict_set = self._collect_conflict_set(working_memory, strategy)
             if not conflict_set:
                 break
 
@@ -63,8 +91,21 @@ class InferenceEngine:
 
         return applied
 
-    def _collect_conflict_set(self, working_memory: WorkingMemory) -> List[Rule]:
-        """Формирует конфликтное множество правил, условия которых выполнены."""
+    def _collect_conflict_set(
+        self,
+        working_memory: WorkingMemory,
+        strategy: ConflictStrategy = "order",
+    ) -> List[Rule]:
+        """
+        Формирует конфликтное множество правил, условия которых выполнены.
+
+        В режиме sharded множество сокращено до лучших по стратегии правил
+        каждой части; разрешение конфликта выбирает из них то же правило.
+        """
+        if self._sharded is not None:
+            return self._sharded.candidates(working_memory, strategy)
+        if self._compiled is not None:
+            return self._compiled(working_memory)
         conflicts: List[Rule] = []
         for rule in self._kb.rules:
             if working_memory.has_fact(rule.conclusion):
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+"""
+Компиляция базы знаний в специализированный код сопоставления правил.
+"""
+
+import weakref
+from typing import Dict, List, Sequence
+
+from knowledge_base import KnowledgeBase, Rule
+from working_memory import WorkingMemory
+
+
+def generate_source(rules: Sequence[Rule]) -> str:
+    """
+    Генерирует исходный код функции match(facts) для набора правил.
+
+    Каждый различный факт проверяется один раз за вызов и сохраняется
+    в локальной переменной; условия всех правил, где он встречается,
+    используют эту переменную. Правила перечисляются в исходном порядке,
+    поэтому конфликтное множество совпадает с интерпретируемым.
+    """
+    names: Dict[str, str] = {}
+
+    def name(fact: str) -> str:
+        if fact not in names:
+            names[fact] = f"f{len(names)}"
+        return names[fact]
+
+    body: List[str] = []
+    for index, rule in enumerate(rules):
+        tests = [f"not {name(rule.conclusion)}"] + [name(condition) for condition in rule.conditions]
+        body.append(f"    if {' and '.join(tests)}:")
+        body.append(f"        append(RULES[{index}])")
+
+    lines = ["def match(facts):", "    conflicts = []", "    append = conflicts.append"]
+    lines += [f"    {variable} = {fact!r} in facts" for fact, variable in names.items()]
+    lines += body
+    lines.append("    return conflicts")
+    return "\n".join(lines) + "\n"
+
+
+class CompiledMatcher:
+    """Сопоставитель правил, скомпилированный из базы знаний."""
+
+    def __init__(self, knowledge_base: KnowledgeBase) -> None:
+        self.rules = knowledge_base.rules
+        self.source = generate_source(self.rules)
+        namespace = {"RULES": self.rules}
+        exec(compile(self.source, "<rules>", "exec"), namespace)
+        self._match = namespace["match"]
+
+    def __call__(self, working_memory: WorkingMemory) -> List[Rule]:
+        """Возвращает конфликтное множество в порядке объявления правил."""
+        return self._match(working_memory.fact_view())
+
+
+# База знаний неизменяема, поэтому скомпилированный код живёт столько же, сколько она сама.
+_CACHE: "weakref.WeakKeyDictionary[KnowledgeBase, CompiledMatcher]" = weakref.WeakKeyDictionary()
+
+
+def compile_knowledge_base(knowledge_base: KnowledgeBase) -> CompiledMatcher:
+    """Возвращает скомпилированный сопоставитель; компиляция выполняется один раз."""
+    matcher = _CACHE.get(knowledge_base)
+    if matcher is None:
+        matcher = CompiledMatcher(knowledge_base)
+        _CACHE[knowledge_base] = matcher
+    return matcher
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+"""
+Параллельное сопоставление правил: база знаний делится на части между процессами.
+"""
+
+import multiprocessing
+import os
+from typing import List, Optional, Sequence
+
+from knowledge_base import KnowledgeBase, Rule
+from working_memory import WorkingMemory
+
+
+STRATEGIES = ("order", "specificity", "recency")
+
+
+def _serve(connection, rules: Sequence[Rule], offset: int, matcher: str) -> None:
+    """
+    Цикл процесса-работника.
+
+    Работник хранит свою часть правил и копию рабочей памяти. На запрос
+    ("match", новые факты, стратегия) он дополняет копию, находит лучшее
+    по стратегии правило своей части и возвращает его номер в базе знаний.
+    """
+    # Импорт здесь: inference_engine сам импортирует этот модуль
+    from inference_engine import InferenceEngine
+
+    engine = InferenceEngine(KnowledgeBase(rules), matcher=matcher)
+    positions = {id(rule): offset + index for index, rule in enumerate(engine._kb.rules)}
+    memory = WorkingMemory()
+    while True:
+        message = connection.recv()
+        if message[0] == "stop":
+            break
+        if message[0] == "reset":
+            memory = WorkingMemory()
+            continue
+        _, facts, strategy = message
+        for fact in facts:
+            memory.add_fact(fact, "coordinator")
+        best = engine._resolve_conflict(engine._collect_conflict_set(memory), strategy, memory)
+        connection.send(None if best is None else positions[id(best)])
+    connection.close()
+
+
+class ShardedMatcher:
+    """
+    Сопоставитель, распределяющий правила по процессам.
+
+    Правила делятся на непрерывные части в порядке объявления. После каждого
+    срабатывания работникам рассылаются только новые факты; каждый возвращает
+    лучшего кандидата своей части, и стратегия, применённая к кандидатам
+    в порядке частей, выбирает то же правило, что и на полном конфликтном
+    множестве (при равенстве выигрывает более раннее правило).
+    """
+
+    def __init__(self, knowledge_base: KnowledgeBase, workers: Optional[int] = None,
+                 shard_matcher: str = "compiled") -> None:
+        self.rules = knowledge_base.rules
+        workers = max(1, min(workers or os.cpu_count() or 1, len(self.rules)))
+        bounds = [len(self.rules) * shard // workers for shard in range(workers + 1)]
+
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for start, stop in zip(bounds, bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_serve,
+                args=(child, self.rules[start:stop], start, shard_matcher),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+        self._memory: Optional[WorkingMemory] = None
+        self._synced = 0
+
+    def _broadcast(self, message) -> None:
+        for connection in self._connections:
+            connection.send(message)
+
+    def candidates(self, working_memory: WorkingMemory, strategy: str) -> List[Rule]:
+        """Возвращает лучших кандидатов частей в порядке объявления правил."""
+        strategy = strategy.lower()
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия разрешения конфликтов: {strategy}")
+        if working_memory is not self._memory:
+            self._broadcast(("reset",))
+            self._memory = working_memory
+            self._synced = 0
+
+        delta = working_memory.items_since(self._synced)
+        self._synced += len(delta)
+        self._broadcast(("match", [record.fact for record in delta], strategy))
+        positions = [connection.recv() for connection in self._connections]
+        return [self.rules[position] for position in positions if position is not None]
+
+    def close(self) -> None:
+        """Останавливает процессы-работники."""
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> "ShardedMatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
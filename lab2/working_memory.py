@@ -5,7 +5,8 @@ from __future__ import annotations
 """
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from itertools import islice
+from typing import Dict, Iterable, KeysView, List, Optional
 
 
 @dataclass(frozen=True)
@@ -48,6 +49,15 @@ class WorkingMemory:
         """Проверяет наличие факта."""
         return fact in self._facts
 
+    def fact_view(self) -> KeysView[str]:
+        """Возвращает живое множество фактов для быстрой проверки вхождения."""
+        return self._facts.keys()
+
+    def items_since(self, timestamp: int) -> List[FactRecord]:
+        """Возвращает записи, добавленные после указанной метки времени, в порядке появления."""
+        # Метки идут подряд с единицы, а словарь хранит порядок добавления
+        return list(islice(self._facts.values(), timestamp, None))
+
     def get_record(self, fact: str) -> FactRecord:
         """Возвращает метаданные факта."""
         return self._facts[fact]
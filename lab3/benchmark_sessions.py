@@ -0,0 +1,88 @@
+"""
+Нагрузочный тест сеансов: пропускная способность и отсутствие взаимного влияния
+
+Запуск: python benchmark_sessions.py [число_консультаций]
+
+Каждая конфигурация сверяется с последовательным прогоном. Потоки
+разделяют одну замороженную базу знаний; в режиме процессов база
+загружается по одному разу на процесс. Из-за GIL чистый Python масштабируется
+линейно по числу ядер только в режиме процессов.
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from knowledge_base import KnowledgeBase
+from session import consult, consult_async, consult_many
+
+KB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge_base.yaml")
+
+_process_kb = None
+
+
+def random_preferences(rng: random.Random) -> dict:
+    """Случайные предпочтения пользователя"""
+    yes_no = lambda: rng.choice(["да", "нет"])
+    return {
+        "Бюджет": rng.randint(10000, 300000),
+        "Ограничения по здоровью": yes_no(),
+        "Хочу море": yes_no(),
+        "Сезон": rng.choice(["лето", "зима"]),
+        "Хочу горы": yes_no(),
+        "Хочу экскурсии": yes_no(),
+        "Есть транспорт": yes_no(),
+        "Короткий отпуск": yes_no()
+    }
+
+
+def _init_process():
+    global _process_kb
+    _process_kb = KnowledgeBase(KB_PATH, frozen=True)
+
+
+def _consult_in_process(preferences: dict):
+    return consult(_process_kb, preferences)
+
+
+async def _consult_all_async(kb, preferences_list):
+    return await asyncio.gather(*(consult_async(kb, p) for p in preferences_list))
+
+
+def _report(label: str, elapsed: float, count: int, results, expected):
+    status = "ok" if results == expected else "РАСХОЖДЕНИЕ"
+    print(f"  {label:<22} {count / elapsed:10.1f} консультаций/с   [{status}]")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(42)
+    preferences_list = [random_preferences(rng) for _ in range(count)]
+    kb = KnowledgeBase(KB_PATH, frozen=True)
+
+    start = time.perf_counter()
+    expected = [consult(kb, p) for p in preferences_list]
+    serial = time.perf_counter() - start
+    print(f"Консультаций: {count}, ядер: {os.cpu_count()}")
+    _report("последовательно", serial, count, expected, expected)
+
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        results = consult_many(kb, preferences_list, max_workers=workers)
+        _report(f"потоки x{workers}", time.perf_counter() - start, count, results, expected)
+
+    start = time.perf_counter()
+    results = asyncio.run(_consult_all_async(kb, preferences_list))
+    _report("asyncio", time.perf_counter() - start, count, results, expected)
+
+    for workers in (1, 2, 4):
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_process) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(_consult_in_process, preferences_list, chunksize=16))
+            _report(f"процессы x{workers}", time.perf_counter() - start, count, results, expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Модуль, реализующий кэш результатов IF-NEEDED демонов с учётом зависимостей
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Ключ слота: (фрейм, имя слота). Фреймы сравниваются по идентичности.
+SlotKey = Tuple[Any, str]
+
+_active_cache: ContextVar[Optional["DemonCache"]] = ContextVar("active_demon_cache", default=None)
+
+
+def current_cache() -> Optional["DemonCache"]:
+    """Возвращает кэш активной консультации (или None вне консультации)"""
+    return _active_cache.get()
+
+
+class _CacheEntry:
+    """Вычисленное значение демона и множество прочитанных им слотов"""
+
+    __slots__ = ("value", "dependencies")
+
+    def __init__(self, value: Any, dependencies: Set[SlotKey]):
+        self.value = value
+        self.dependencies = dependencies
+
+
+class DemonCache:
+    """
+    Кэш IF-NEEDED демонов, ограниченный одной консультацией.
+
+    Вычисленные значения хранятся здесь, а не в слотах, поэтому фреймы
+    общей базы знаний не изменяются. Для каждого значения запоминаются
+    слоты, прочитанные демоном; запись лишь в эти слоты делает значение
+    недействительным.
+    """
+
+    def __init__(self):
+        self._entries: Dict[SlotKey, _CacheEntry] = {}
+        # Обратный индекс: слот -> ключи значений, которые от него зависят
+        self._dependents: Dict[SlotKey, Set[SlotKey]] = {}
+        # Стек множеств зависимостей вычисляемых в данный момент демонов
+        self._reads: List[Set[SlotKey]] = []
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def activate(self):
+        """Делает кэш активным для текущего потока/задачи"""
+        token = _active_cache.set(self)
+        try:
+            yield self
+        finally:
+            _active_cache.reset(token)
+
+    def record_read(self, frame, slot_name: str):
+        """Регистрирует чтение слота вычисляемым демоном"""
+        if self._reads:
+            self._reads[-1].add((frame, slot_name))
+
+    def evaluate(self, frame, slot_name: str, demon: Callable[[Any], Any],
+                 accept: Callable[[Any], bool]) -> Any:
+        """Возвращает значение демона из кэша или вычисляет и запоминает его"""
+        key = (frame, slot_name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            # Внешний демон зависит от всего, от чего зависит кэшированное значение
+            if self._reads:
+                self._reads[-1].update(entry.dependencies)
+            return entry.value
+
+        self.misses += 1
+        self._reads.append(set())
+        try:
+            value = demon(frame)
+        finally:
+            dependencies = self._reads.pop()
+        if not accept(value):
+            value = None
+
+        self._entries[key] = _CacheEntry(value, dependencies)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(key)
+        if self._reads:
+            self._reads[-1].update(dependencies)
+        return value
+
+    def invalidate(self, frame, slot_name: str):
+        """Сбрасывает значения, зависящие (в том числе транзитивно) от слота"""
+        pending = [(frame, slot_name)]
+        while pending:
+            changed = pending.pop()
+            for key in self._dependents.pop(changed, ()):
+                if self._entries.pop(key, None) is not None:
+                    # Значение демона тоже является слотом, который могли читать другие
+                    pending.append(key)
+
+    def clear(self):
+        """Полностью очищает кэш"""
+        self._entries.clear()
+        self._dependents.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -12,6 +12,10 @@ class ExplanationComponent:
     
     def explain_recommendation(self, location_name: str) -> str:
         """Объясняет, почему данное место было рекомендовано"""
+        with self.ie.working_memory.demon_cache.activate():
+            return self._explain_recommendation(location_name)
+    
+    def _explain_recommendation(self, location_name: str) -> str:
         # Находим соответствующий протофрейм
         proto_frames = self.ie.working_memory.get_proto_frames()
         target_proto = None
@@ -3,6 +3,7 @@
 """
 from typing import Dict, Any, List, Optional, Callable, Union
 from enum import Enum
+from demon_cache import current_cache
 
 class InheritanceType(Enum):
     """Типы наследования согласно теории Минского"""
@@ -63,6 +64,8 @@ class Slot:
     
     def set_value(self, frame, value: Any):
         """Установка значения с валидацией и триггерами"""
+        _check_mutable(frame)
+        
         # Валидация типа
         if not self._validate_type(value):
             raise ValueError(f"Неверный тип данных '{type(value).__name__}' для слота {self.name}. Ожидается {self.data_type.value}")
@@ -73,39 +76,60 @@ class Slot:
         
         old_value = self.value
         self.value = value
+        _notify_changed(frame, self.name)
         
         # Вызов IF-ADDED триггера
         if TriggerType.IF_ADDED in self.triggers:
             self.triggers[TriggerType.IF_ADDED](frame, old_value, value)
     
+    def _accepts(self, value: Any) -> bool:
+        """Проверка вычисленного значения на тип и диапазон"""
+        return self._validate_type(value) and self._validate_range(value)
+    
     def get_value(self, frame) -> Any:
         """Получение значения с поддержкой IF-NEEDED"""
         if self.value is None:
-            # Вызов IF-NEEDED триггера для вычисления значения
+            # Вызов IF-NEEDED триггера для вычисления значения.
+            # Результат не записывается в слот: в рамках консультации он
+            # хранится в её кэше демонов, вне консультации вычисляется заново.
             if TriggerType.IF_NEEDED in self.triggers:
-                computed_value = self.triggers[TriggerType.IF_NEEDED](frame)
-                # Временно устанавливаем вычисленное значение
-                if self._validate_type(computed_value) and self._validate_range(computed_value):
-                    self.value = computed_value
-                    return computed_value
-                else:
-                    return None
+                demon = self.triggers[TriggerType.IF_NEEDED]
+                cache = current_cache()
+                if cache is not None:
+                    return cache.evaluate(frame, self.name, demon, self._accepts)
+                computed_value = demon(frame)
+                return computed_value if self._accepts(computed_value) else None
             return None
         return self.value
     
     def remove_value(self, frame):
         """Удаление значения с вызовом IF-REMOVED"""
+        _check_mutable(frame)
         old_value = self.value
         self.value = None
+        _notify_changed(frame, self.name)
         
         if TriggerType.IF_REMOVED in self.triggers:
             self.triggers[TriggerType.IF_REMOVED](frame, old_value)
 
+def _check_mutable(frame):
+    """Запрещает изменение замороженных фреймов общей базы знаний"""
+    if getattr(frame, "frozen", False):
+        raise RuntimeError(f"Фрейм '{frame.name}' принадлежит замороженной базе знаний и не может изменяться")
+
+def _notify_changed(frame, slot_name: str):
+    """Сообщает кэшу активной консультации об изменении слота"""
+    cache = current_cache()
+    if cache is not None:
+        cache.invalidate(frame, slot_name)
+
 class Frame:
     """Фрейм согласно теории Марвина Минского"""
     
     def __init__(self, name: str):
         self.name = name
+        # Замороженный фрейм разделяется между сеансами и не изменяется
+        self.frozen = False
         # Системные слоты
         self.slots: Dict[str, Slot] = {}
         
@@ -115,7 +139,9 @@ class Frame:
     
     def add_slot(self, slot: Slot):
         """Добавление слота во фрейм"""
+        _check_mutable(self)
         self.slots[slot.name] = slot
+        _notify_changed(self, slot.name)
     
     def get_slot(self, slot_name: str) -> Optional[Slot]:
         """Получение слота по имени"""
@@ -123,6 +149,10 @@ class Frame:
     
     def get_slot_value(self, slot_name: str) -> Any:
         """Получение значения слота с полной поддержкой наследования"""
+        cache = current_cache()
+        if cache is not None:
+            cache.record_read(self, slot_name)
+        
         if slot_name in self.slots:
             slot = self.slots[slot_name]
             value = slot.get_value(self)
@@ -130,6 +160,8 @@ class Frame:
                 return value
         
         # Наследование через AKO
+        if cache is not None:
+            cache.record_read(self, "AKO")
         ako_frame = self.slots["AKO"].value
         if ako_frame and hasattr(ako_frame, 'get_slot_value'):
             ako_value = ako_frame.get_slot_value(slot_name)
@@ -160,16 +192,20 @@ class Frame:
     
     def set_slot_value(self, slot_name: str, value: Any):
         """Установка значения слота"""
+        _check_mutable(self)
         if slot_name not in self.slots:
             # Создаем новый слот по умолчанию
             new_slot = Slot(slot_name, value)
             self.slots[slot_name] = new_slot
+            _notify_changed(self, slot_name)
         else:
             self.slots[slot_name].set_value(self, value)
     
     def set_ako(self, parent_frame: 'Frame'):
         """Установка родительского фрейма через AKO"""
+        _check_mutable(self)
         self.slots["AKO"].value = parent_frame
+        _notify_changed(self, "AKO")
     
     def is_a(self, frame_type: str) -> bool:
         """Проверяет, является ли фрейм экземпляром указанного типа"""
@@ -184,6 +220,10 @@ class Frame:
                 break
         return False
     
+    def freeze(self):
+        """Запрещает дальнейшие изменения фрейма"""
+        self.frozen = True
+    
     def create_proto_frame(self) -> 'Frame':
         """Создает протофрейм (незаполненную копию)"""
         proto = Frame(f"Proto_{self.name}")
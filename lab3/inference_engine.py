@@ -1,17 +1,19 @@
 """
 Модуль, реализующий механизм логического вывода для фреймовой системы Минского
 """
+import time
 from typing import Dict, Any, List, Optional
 from knowledge_base import KnowledgeBase
 from working_memory import WorkingMemory
+from inference_trace import TraceRecorder
 from frame import Frame
 
 class InferenceEngine:
     """Механизм логического вывода для фреймовой системы Минского"""
     
-    def __init__(self, knowledge_base: KnowledgeBase):
+    def __init__(self, knowledge_base: KnowledgeBase, trace: Optional[TraceRecorder] = None):
         self.kb = knowledge_base
-        self.working_memory = WorkingMemory()
+        self.working_memory = WorkingMemory(trace)
     
     def reset(self):
         """Сбрасывает рабочую память"""
@@ -61,14 +63,24 @@ class InferenceEngine:
     
     def frame_based_inference(self) -> List[Frame]:
         """Выполняет вывод на основе фреймов согласно теории Минского"""
+        with self.working_memory.demon_cache.activate():
+            return self._frame_based_inference()
+    
+    def _frame_based_inference(self) -> List[Frame]:
         preferences = self.working_memory.get_preferences()
         specific_locations = self.kb.get_specific_locations()
+        # Каждый вывод строит протофреймы заново, прежние не накапливаются
+        self.working_memory.clear_frames()
+        # Лимит трассы действует на один вывод, а не на всё время работы
+        self.working_memory.trace.start_session()
         
         # 1. Создаем протофреймы для каждого возможного места
         proto_frames = []
         matched_frames = []
         
         for location in specific_locations:
+            started = time.perf_counter()
+            
             # 2. Создаем протофрейм
             proto_frame = location.create_proto_frame()
             self.working_memory.add_proto_frame(proto_frame)
@@ -83,7 +95,9 @@ class InferenceEngine:
                 try:
                     proto_frame.set_slot_value("бюджет_требование", budget_pref)
                 except ValueError:
-                    continue  # Пропускаем несовместимые варианты
+                    # Пропускаем несовместимые варианты
+                    self._record_score(proto_frame, location, None, False, started)
+                    continue
             
             # Страна
             country_pref = "заграница" if preferences.get("Возможна заграница") == "да" else "Россия"
@@ -105,16 +119,23 @@ class InferenceEngine:
                 # Вычисляем совместимость вручную
                 compatibility = self._calculate_manual_compatibility(proto_frame, preferences)
             
-            if compatibility and compatibility > 0.3:
+            matched = bool(compatibility and compatibility > 0.3)
+            if matched:
                 matched_frames.append(proto_frame)
-                self.working_memory.add_trace_entry({
-                    "протофрейм": proto_frame.name,
-                    "экзофрейм": location.name,
-                    "совместимость": compatibility
-                })
+            self._record_score(proto_frame, location, compatibility, matched, started)
         
         return matched_frames
     
+    def _record_score(self, proto_frame: Frame, location: Frame, compatibility: Optional[float],
+                      matched: bool, started: float):
+        """Записывает в трассу оценку варианта (в том числе отклонённого) и время её расчёта"""
+        self.working_memory.add_trace_entry({
+            "протофрейм": proto_frame.name,
+            "экзофрейм": location.name,
+            "совместимость": compatibility,
+            "принят": matched
+        }, kind="frame_scored", duration=time.perf_counter() - started)
+    
     def _calculate_manual_compatibility(self, proto_frame: Frame, preferences: Dict[str, Any]) -> float:
         """Ручной расчет совместимости для демонстрации"""
         score = 0.0
@@ -0,0 +1,94 @@
+"""
+Модуль, реализующий ограниченную структурированную трассу вывода
+"""
+import json
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+@dataclass
+class TraceEvent:
+    """Событие трассы вывода"""
+    kind: str                       # вид события, например "frame_scored"
+    data: Dict[str, Any]            # полезная нагрузка (как прежние записи trace)
+    timestamp: float = field(default_factory=time.time)
+    duration: Optional[float] = None  # длительность этапа в секундах
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Представление события для экспорта"""
+        return asdict(self)
+
+
+class TraceRecorder:
+    """
+    Трасса вывода с настраиваемым хранением.
+
+    max_events  - размер кольцевого буфера: хранятся последние события;
+    sample_rate - доля записываемых событий (0..1);
+    session_cap - предельное число событий, принимаемых за сеанс
+                  (None - без ограничения); лишние события отбрасываются.
+                  Сеанс начинается вызовом start_session() или clear().
+    """
+
+    def __init__(self, max_events: int = 1000, sample_rate: float = 1.0,
+                 session_cap: Optional[int] = None, seed: Optional[int] = None):
+        if max_events < 1:
+            raise ValueError("Размер буфера трассы должен быть положительным")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Доля выборки трассы должна лежать в диапазоне [0, 1]")
+        self.max_events = max_events
+        self.sample_rate = sample_rate
+        self.session_cap = session_cap
+        self._events: Deque[TraceEvent] = deque(maxlen=max_events)
+        self._random = random.Random(seed)
+        self.accepted = 0
+        self.dropped = 0
+        self.session_accepted = 0
+
+    def start_session(self):
+        """Начинает новый сеанс: обнуляет счётчик для session_cap, события сохраняются"""
+        self.session_accepted = 0
+
+    def record(self, kind: str, data: Dict[str, Any], duration: Optional[float] = None) -> bool:
+        """Записывает событие; возвращает False, если оно отброшено выборкой или лимитом"""
+        if self.session_cap is not None and self.session_accepted >= self.session_cap:
+            self.dropped += 1
+            return False
+        if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+            self.dropped += 1
+            return False
+        self._events.append(TraceEvent(kind, data, duration=duration))
+        self.accepted += 1
+        self.session_accepted += 1
+        return True
+
+    def events(self) -> List[TraceEvent]:
+        """Возвращает сохранённые события (от старых к новым)"""
+        return list(self._events)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Возвращает полезную нагрузку событий в прежнем формате записей trace"""
+        return [event.data for event in self._events]
+
+    def export_jsonl(self, path: str, append: bool = True) -> int:
+        """Выгружает события в файл JSON lines; возвращает число записанных строк"""
+        with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+            for event in self._events:
+                f.write(json.dumps(event.to_dict(), ensure_ascii=False, default=str) + "\n")
+        return len(self._events)
+
+    def clear(self):
+        """Очищает трассу и счётчики сеанса"""
+        self._events.clear()
+        self.accepted = 0
+        self.dropped = 0
+        self.session_accepted = 0
+
+    def __iter__(self) -> Iterator[TraceEvent]:
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
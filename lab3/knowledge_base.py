@@ -5,13 +5,33 @@ import yaml
 from typing import Dict, List, Any, Optional
 from frame import Frame, Slot, DataType, InheritanceType, TriggerType
 
+# Конкретные места (не абстрактные типы)
+SPECIFIC_LOCATIONS = [
+    "Черноморье", "Крым", "Турция", "Таиланд", "Кавказ", "Сочи", "Домбай", 
+    "Карпаты", "Альпы", "Москва", "Казань", "Париж", "Прага"
+]
+
 class KnowledgeBase:
     """База знаний, хранящая фреймы согласно теории Минского"""
     
-    def __init__(self, yaml_file: str):
+    def __init__(self, yaml_file: str, frozen: bool = False):
         self.frames: Dict[str, Frame] = {}
         self._procedures = {}
+        self.frozen = False
         self.load_from_yaml(yaml_file)
+        if frozen:
+            self.freeze()
+    
+    def freeze(self):
+        """
+        Замораживает базу знаний.
+        
+        После заморозки фреймы только читаются, поэтому одна база может
+        обслуживать множество сеансов из разных потоков одновременно.
+        """
+        for frame in self.frames.values():
+            frame.freeze()
+        self.frozen = True
     
     def _register_procedures(self):
         """Регистрация встроенных процедур"""
@@ -70,8 +90,32 @@ class KnowledgeBase:
                 continue
         return triggers
     
+    def _build_slot(self, slot_data: Dict[str, Any]) -> Slot:
+        """Создаёт слот по его описанию из базы знаний"""
+        # Парсим триггеры
+        triggers = {}
+        if 'triggers' in slot_data:
+            triggers = self._parse_triggers(slot_data['triggers'])
+        
+        return Slot(
+            name=slot_data['name'],
+            value=slot_data.get('value'),
+            data_type=DataType(slot_data.get('data_type', 'TEXT')),
+            inheritance=InheritanceType(slot_data.get('inheritance', 'O')),
+            range_values=slot_data.get('range', []),
+            triggers=triggers
+        )
+    
+    def _add_slots(self, frame: Frame, frame_data: Dict[str, Any]):
+        """Добавляет во фрейм слоты из его описания"""
+        for slot_data in frame_data.get('slots') or []:
+            frame.add_slot(self._build_slot(slot_data))
+    
     def load_from_yaml(self, yaml_file: str):
         """Загружает фреймы из YAML файла согласно теории Минского"""
+        if self.frozen:
+            raise RuntimeError("База знаний заморожена и не может быть перезагружена")
+        
         with open(yaml_file, 'r', encoding='utf-8') as f:
             data = yaml.safe_load(f)
         
@@ -96,38 +140,7 @@ class KnowledgeBase:
                     frame.set_ako(frame_objects[parent_name])
             
             # Устанавливаем слоты
-            if 'slots' in frame_data:
-                for slot_data in frame_data['slots']:
-                    slot_name = slot_data['name']
-                    
-                    # Определяем тип данных
-                    data_type = DataType(slot_data.get('data_type', 'TEXT'))
-                    
-                    # Определяем тип наследования
-                    inheritance = InheritanceType(slot_data.get('inheritance', 'O'))
-                    
-                    # Получаем значение
-                    value = slot_data.get('value')
-                    
-                    # Получаем диапазон значений
-                    range_values = slot_data.get('range', [])
-                    
-                    # Парсим триггеры
-                    triggers = {}
-                    if 'triggers' in slot_data:
-                        triggers = self._parse_triggers(slot_data['triggers'])
-                    
-                    # Создаем слот
-                    slot = Slot(
-                        name=slot_name,
-                        value=value,
-                        data_type=data_type,
-                        inheritance=inheritance,
-                        range_values=range_values,
-                        triggers=triggers
-                    )
-                    
-                    frame.add_slot(slot)
+            self._add_slots(frame, frame_data)
         
         self.frames = frame_objects
     
@@ -141,8 +154,4 @@ class KnowledgeBase:
     
     def get_specific_locations(self) -> List[Frame]:
         """Возвращает только конкретные места (не абстрактные типы)"""
-        specific_names = [
-            "Черноморье", "Крым", "Турция", "Таиланд", "Кавказ", "Сочи", "Домбай", 
-            "Карпаты", "Альпы", "Москва", "Казань", "Париж", "Прага"
-        ]
-        return [self.frames[name] for name in specific_names if name in self.frames]
\ No newline at end of file
+        return [self.frames[name] for name in SPECIFIC_LOCATIONS if name in self.frames]
\ No newline at end of file
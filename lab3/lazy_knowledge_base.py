@@ -0,0 +1,170 @@
+"""
+Модуль, реализующий ленивую загрузку больших фреймовых баз знаний
+
+YAML-каталог один раз компилируется в строчный файл: по строке на фрейм,
+строки отсортированы по имени фрейма. Отсортированный файл сам служит
+индексом смещений: фрейм находится двоичным поиском по отображённому в
+память файлу, поэтому время старта и резидентная память не зависят от
+размера каталога. Фрейм и его предки материализуются при первом обращении
+и хранятся в LRU-кэше ограниченного размера. Вытесненный фрейм, на который
+ещё ссылаются потомки через AKO (или вызывающий код), возвращается тем же
+объектом, поэтому в памяти кроме кэша остаются лишь такие фреймы.
+
+Компиляция: python lazy_knowledge_base.py knowledge_base.yaml knowledge_base.frames
+"""
+import json
+import mmap
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+from frame import Frame
+from knowledge_base import KnowledgeBase, SPECIFIC_LOCATIONS
+
+FORMAT_HEADER = b"# frames v1\n"
+
+
+def _record_key(name: str) -> bytes:
+    """Ключ строки: имя фрейма в JSON (без табуляций и переводов строк)"""
+    return json.dumps(name, ensure_ascii=False).encode('utf-8')
+
+
+def compile_catalogue(yaml_file: str, output_file: str) -> int:
+    """Компилирует YAML-каталог фреймов в строчный формат; возвращает число фреймов"""
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+
+    lines = []
+    for frame_data in data['frames']:
+        record = json.dumps(frame_data, ensure_ascii=False).encode('utf-8')
+        lines.append(_record_key(frame_data['name']) + b"\t" + record + b"\n")
+    lines.sort()
+
+    with open(output_file, 'wb') as f:
+        f.write(FORMAT_HEADER)
+        f.writelines(lines)
+    return len(lines)
+
+
+class LazyKnowledgeBase(KnowledgeBase):
+    """База знаний, материализующая фреймы из скомпилированного каталога по требованию"""
+
+    def __init__(self, compiled_file: str, cache_size: int = 1024, frozen: bool = False):
+        if cache_size < 1:
+            raise ValueError("Размер кэша фреймов должен быть положительным")
+        self.frames: Dict[str, Frame] = OrderedDict()
+        # Все материализованные и ещё достижимые фреймы: один объект на имя
+        self._live: "weakref.WeakValueDictionary[str, Frame]" = weakref.WeakValueDictionary()
+        self.cache_size = cache_size
+        self.frozen = frozen
+        self._procedures = {}
+        self._register_procedures()
+        self._lock = threading.RLock()
+
+        self._file = open(compiled_file, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(FORMAT_HEADER)] != FORMAT_HEADER:
+            self.close()
+            raise ValueError(f"Файл '{compiled_file}' не является скомпилированным каталогом фреймов")
+        self._start = len(FORMAT_HEADER)
+
+    def close(self):
+        """Освобождает отображение файла каталога"""
+        self._data.close()
+        self._file.close()
+
+    def load_from_yaml(self, yaml_file: str):
+        """Не поддерживается: каталог сначала компилируется"""
+        raise RuntimeError("Ленивая база знаний читает только скомпилированный каталог (compile_catalogue)")
+
+    def freeze(self):
+        """Замораживает уже материализованные и все будущие фреймы"""
+        with self._lock:
+            for frame in list(self._live.values()):
+                frame.freeze()
+            self.frozen = True
+
+    def _line_start(self, position: int) -> int:
+        """Начало строки, содержащей позицию"""
+        return self._data.rfind(b"\n", self._start - 1, position) + 1
+
+    def _find_record(self, name: str) -> Optional[Dict[str, Any]]:
+        """Двоичный поиск строки фрейма по имени"""
+        key = _record_key(name)
+        low, high = self._start, len(self._data)
+        while low < high:
+            line_start = self._line_start((low + high) // 2)
+            tab = self._data.find(b"\t", line_start)
+            line_end = self._data.find(b"\n", tab)
+            line_key = self._data[line_start:tab]
+            if line_key == key:
+                return json.loads(self._data[tab + 1:line_end])
+            if line_key < key:
+                low = line_end + 1
+            else:
+                high = line_start
+        return None
+
+    def _iter_names(self) -> Iterator[str]:
+        """Последовательно перебирает имена фреймов каталога"""
+        position = self._start
+        while position < len(self._data):
+            tab = self._data.find(b"\t", position)
+            yield json.loads(self._data[position:tab])
+            position = self._data.find(b"\n", tab) + 1
+
+    def _materialize(self, frame_data: Dict[str, Any]) -> Frame:
+        """Создаёт фрейм вместе с цепочкой его предков"""
+        frame = Frame(frame_data['name'])
+        parent_name = frame_data.get('ako')
+        if parent_name:
+            parent = self.get_frame(parent_name)
+            if parent is not None:
+                frame.set_ako(parent)
+        self._add_slots(frame, frame_data)
+        if self.frozen:
+            frame.freeze()
+        return frame
+
+    def get_frame(self, name: str) -> Optional[Frame]:
+        """Возвращает фрейм по имени, материализуя его при первом обращении"""
+        with self._lock:
+            frame = self.frames.get(name)
+            if frame is not None:
+                self.frames.move_to_end(name)
+                return frame
+
+            frame = self._live.get(name)
+            if frame is None:
+                frame_data = self._find_record(name)
+                if frame_data is None:
+                    return None
+                frame = self._materialize(frame_data)
+                self._live[name] = frame
+            self.frames[name] = frame
+            # Вытесненные предки остаются доступны через AKO своих потомков
+            # и при следующем обращении берутся из _live
+            while len(self.frames) > self.cache_size:
+                self.frames.popitem(last=False)
+            return frame
+
+    def get_all_frames(self) -> List[Frame]:
+        """Возвращает все фреймы (материализует весь каталог)"""
+        return [self.get_frame(name) for name in self._iter_names()]
+
+    def get_specific_locations(self) -> List[Frame]:
+        """Возвращает только конкретные места (не абстрактные типы)"""
+        frames = (self.get_frame(name) for name in SPECIFIC_LOCATIONS)
+        return [frame for frame in frames if frame is not None]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Использование: python lazy_knowledge_base.py <каталог.yaml> <выход.frames>")
+        sys.exit(1)
+    count = compile_catalogue(sys.argv[1], sys.argv[2])
+    print(f"Скомпилировано {count} фреймов в {sys.argv[2]}")
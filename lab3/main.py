@@ -57,7 +57,7 @@ def main():
     
     try:
         # Создаем компоненты системы
-        kb = KnowledgeBase("knowledge_base.yaml")
+        kb = KnowledgeBase("knowledge_base.yaml", frozen=True)
         ie = InferenceEngine(kb)
         ec = ExplanationComponent(ie)
         
@@ -0,0 +1,73 @@
+"""
+Модуль, реализующий сеансы консультаций над общей замороженной базой знаний
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from knowledge_base import KnowledgeBase
+from inference_engine import InferenceEngine
+from inference_trace import TraceRecorder
+from explanation_component import ExplanationComponent
+
+
+@dataclass
+class ConsultationResult:
+    """Итог одной консультации"""
+    recommendations: List[str]
+    best: Optional[str]
+    explanation: Optional[str]
+    trace: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class Session:
+    """
+    Лёгкий сеанс консультации.
+
+    База знаний общая и только читается; предпочтения, протофреймы,
+    кэш демонов и трасса вывода принадлежат сеансу (его рабочей памяти).
+    """
+
+    def __init__(self, knowledge_base: KnowledgeBase, trace: Optional[TraceRecorder] = None):
+        if not knowledge_base.frozen:
+            raise ValueError("Сеансы разделяют только замороженную базу знаний (KnowledgeBase.freeze())")
+        self.engine = InferenceEngine(knowledge_base, trace)
+        self.explainer = ExplanationComponent(self.engine)
+
+    @property
+    def working_memory(self):
+        """Рабочая память сеанса"""
+        return self.engine.working_memory
+
+    def consult(self, preferences: Dict[str, Any]) -> ConsultationResult:
+        """Выполняет полную консультацию по предпочтениям пользователя"""
+        self.engine.reset()
+        self.engine.set_user_preferences(preferences)
+        matched = self.engine.frame_based_inference()
+
+        best = self.engine.get_best_recommendation() if matched else None
+        explanation = self.explainer.explain_recommendation(best) if best else None
+        return ConsultationResult(
+            recommendations=[frame.slots["AKO"].value.name for frame in matched],
+            best=best,
+            explanation=explanation,
+            trace=list(self.working_memory.get_trace())
+        )
+
+
+def consult(knowledge_base: KnowledgeBase, preferences: Dict[str, Any]) -> ConsultationResult:
+    """Проводит консультацию в новом сеансе"""
+    return Session(knowledge_base).consult(preferences)
+
+
+def consult_many(knowledge_base: KnowledgeBase, preferences_list: List[Dict[str, Any]],
+                 max_workers: Optional[int] = None) -> List[ConsultationResult]:
+    """Обслуживает набор консультаций пулом потоков; порядок результатов сохраняется"""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda preferences: consult(knowledge_base, preferences), preferences_list))
+
+
+async def consult_async(knowledge_base: KnowledgeBase, preferences: Dict[str, Any]) -> ConsultationResult:
+    """Проводит консультацию, не блокируя цикл событий asyncio"""
+    return await asyncio.to_thread(consult, knowledge_base, preferences)
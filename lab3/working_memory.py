@@ -1,17 +1,20 @@
 """
 Модуль, реализующий рабочую память экспертной системы
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from frame import Frame
+from demon_cache import DemonCache
+from inference_trace import TraceRecorder
 
 class WorkingMemory:
     """Рабочая память для хранения текущих фактов и истории вывода"""
     
-    def __init__(self):
+    def __init__(self, trace: Optional[TraceRecorder] = None):
         self.user_preferences: Dict[str, Any] = {}
         self.proto_frames: List[Frame] = []  # Протофреймы пользователя
         self.exo_frames: List[Frame] = []    # Экзофреймы из БЗ
-        self.trace: list = []  # история вывода
+        self.trace = trace if trace is not None else TraceRecorder()  # история вывода (ограниченная)
+        self.demon_cache = DemonCache()  # значения IF-NEEDED демонов консультации
     
     def set_preferences(self, preferences: Dict[str, Any]):
         """Устанавливает предпочтения пользователя"""
@@ -25,9 +28,15 @@ class WorkingMemory:
         """Добавляет экзофрейм"""
         self.exo_frames.append(exo_frame)
     
-    def add_trace_entry(self, entry: Dict[str, Any]):
+    def add_trace_entry(self, entry: Dict[str, Any], kind: str = "entry",
+                        duration: Optional[float] = None):
         """Добавляет запись в историю вывода"""
-        self.trace.append(entry)
+        self.trace.record(kind, entry, duration)
+    
+    def clear_frames(self):
+        """Удаляет протофреймы и экзофреймы предыдущего вывода"""
+        self.proto_frames = []
+        self.exo_frames = []
     
     def get_preferences(self) -> Dict[str, Any]:
         """Возвращает предпочтения пользователя"""
@@ -42,12 +51,12 @@ class WorkingMemory:
         return self.exo_frames
     
     def get_trace(self) -> list:
-        """Возвращает историю вывода"""
-        return self.trace
+        """Возвращает историю вывода (оценки отклонённых вариантов не включаются)"""
+        return [entry for entry in self.trace.entries() if entry.get("принят", True)]
     
     def clear(self):
         """Очищает рабочую память"""
         self.user_preferences = {}
-        self.proto_frames = []
-        self.exo_frames = []
-        self.trace = []
\ No newline at end of file
+        self.clear_frames()
+        self.trace.clear()
+        self.demon_cache = DemonCache()
\ No newline at end of file
@@ -0,0 +1,132 @@
+import argparse
+import csv
+import json
+import math
+import sys
+from collections.abc import Callable
+
+from profile_engine import WINNER_RULES, CompressedProfile, PairwiseTally, ProfileEngine
+
+# Разделитель равноценных альтернатив в ячейке CSV: "a=b"
+TIE_SEPARATOR = "="
+
+# Подробный результат каждого правила; победитель берётся из WINNER_RULES
+RULE_DETAILS = {
+    "relative_majority": lambda tally: {"counts": tally.relative_majority()[1]}
+    if tally.n_voters and not tally.n_empty else {},
+    "condorcet": lambda tally: {},
+    "copeland": lambda tally: {"scores": tally.copeland_score()},
+    "simpson": lambda tally: {"scores": tally.simpson_score()},
+    "borda": lambda tally: {"scores": tally.borda_count()},
+    "schulze": lambda tally: {"ranking": tally.schulze_ranking()},
+    "ranked_pairs": lambda tally: {"ranking": tally.ranked_pairs_ranking()},
+    "kemeny": lambda tally: {"ranking": tally.kemeny_ranking()},
+}
+
+
+def _parse_csv_cell(cell: str) -> str | list[str]:
+    names = [name.strip() for name in cell.split(TIE_SEPARATOR)]
+    return names[0] if len(names) == 1 else names
+
+
+def load_election(path: str, alternatives: list[str] | None = None) -> tuple[list[str], CompressedProfile]:
+    """
+    Загружает альтернативы и бюллетени из JSON или CSV.
+
+    JSON: {"alternatives": [...], "ballots": [...]}, где бюллетень — список
+    альтернатив (вложенный список — группа равноценных) или
+    {"ranking": [...], "count": k}.
+    CSV: строка — бюллетень, ячейка "a=b" — группа равноценных альтернатив.
+    Если список альтернатив не задан, они берутся в порядке первого появления.
+    """
+    profile = CompressedProfile()
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        alternatives = alternatives or data.get("alternatives")
+        for ballot in data["ballots"]:
+            if isinstance(ballot, dict):
+                profile.add(ballot["ranking"], ballot.get("count", 1))
+            else:
+                profile.add(ballot)
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                cells = [cell for cell in row if cell.strip()]
+                if cells:
+                    profile.add([_parse_csv_cell(cell) for cell in cells])
+
+    if not alternatives:
+        seen = {}
+        for ranking, _ in profile.items():
+            for entry in ranking:
+                seen.update(dict.fromkeys([entry] if isinstance(entry, str) else entry))
+        alternatives = list(seen)
+    return list(alternatives), profile
+
+
+def evaluate(tally: PairwiseTally, rules: list[str] | None = None,
+             progress: Callable[[int, int], None] | None = None) -> dict[str, dict]:
+    """
+    Результаты выбранных правил (по умолчанию — всех) по одной сводке профиля.
+
+    progress(выполнено, всего) вызывается после каждого правила.
+    """
+    rules = rules or list(WINNER_RULES)
+    results = {}
+    for done, rule in enumerate(rules, 1):
+        if rule not in WINNER_RULES:
+            raise ValueError(f"Неизвестное правило: {rule}")
+        results[rule] = {"winner": WINNER_RULES[rule](tally), **RULE_DETAILS[rule](tally)}
+        if progress:
+            progress(done, len(rules))
+    return results
+
+
+def _json_value(value):
+    """Бесконечные очки Симпсона (нет соперников) записываются как null."""
+    if isinstance(value, float) and math.isinf(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def run(path: str, alternatives: list[str] | None = None, rules: list[str] | None = None) -> dict:
+    """Загружает выборы из файла и возвращает результаты в виде, пригодном для JSON."""
+    alternatives, profile = load_election(path, alternatives)
+    tally = ProfileEngine(profile, alternatives)
+    return _json_value({
+        "alternatives": alternatives,
+        "voters": tally.n_voters,
+        "distinct_ballots": profile.n_distinct,
+        "complete": tally.complete,
+        "results": evaluate(tally, rules),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Подсчёт голосов без графического интерфейса")
+    parser.add_argument("path", help="файл выборов (.json или .csv)")
+    parser.add_argument("--alternatives", help="альтернативы через запятую")
+    parser.add_argument("--rules", nargs="+", choices=list(WINNER_RULES), help="правила (по умолчанию все)")
+    parser.add_argument("--output", help="файл для результатов (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    alternatives = [alt.strip() for alt in args.alternatives.split(",")] if args.alternatives else None
+    try:
+        result = run(args.path, alternatives, args.rules)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        parser.error(f"не удалось загрузить {args.path}: {error}")
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
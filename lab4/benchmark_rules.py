@@ -0,0 +1,53 @@
+"""
+Время работы правил в зависимости от числа альтернатив m
+
+Запуск: python benchmark_rules.py [число_избирателей]
+
+Профиль строится один раз (импартиальная культура), далее все правила
+вычисляются по матрице попарного большинства. Ожидаемая сложность по m:
+Копленд/Симпсон — O(m²), Шульце — O(m³), ранжированные пары — O(m⁴) в худшем
+случае, Кемени–Янг — O(m·2^m) точно до KEMENY_EXACT_LIMIT, далее локальный поиск.
+"""
+import sys
+import time
+
+import numpy as np
+
+from condorcet_methods import KEMENY_EXACT_LIMIT
+from tally import IncrementalTally
+
+RULES = {
+    "Копленд": lambda tally: tally.copeland_score(),
+    "Симпсон": lambda tally: tally.simpson_score(),
+    "Шульце": lambda tally: tally.schulze_ranking(),
+    "Ранж. пары": lambda tally: tally.ranked_pairs_ranking(),
+    "Кемени–Янг": lambda tally: tally.kemeny_ranking(),
+}
+
+
+def timed(function, *args, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, мс."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    voters = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = np.random.default_rng(0)
+    print(f"Избирателей: {voters}; Кемени–Янг точно до m = {KEMENY_EXACT_LIMIT}")
+    print(f"{'m':>4} {'профиль, мс':>12}" + "".join(f"{name:>13}" for name in RULES))
+    for m in (4, 8, 12, 16, 24, 32, 64):
+        alternatives = [f"a{i}" for i in range(m)]
+        positions = rng.random((voters, m)).argsort(axis=1).argsort(axis=1)
+        build = timed(IncrementalTally.from_positions, alternatives, positions)
+        tally = IncrementalTally.from_positions(alternatives, positions)
+        times = [timed(rule, tally) for rule in RULES.values()]
+        print(f"{m:>4} {build:>12.2f}" + "".join(f"{t:>13.2f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
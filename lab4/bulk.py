@@ -0,0 +1,175 @@
+import argparse
+import csv
+import io
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+
+from tally import IncrementalTally
+
+# Бинарный файл бюллетеней: строка-заголовок JSON, затем строки фиксированной
+# ширины m с индексами альтернатив в порядке предпочтения. Значения >= m
+# (например, 255 для uint8) означают пустую позицию усечённого бюллетеня.
+RANK_FILE_MAGIC = "ballots-v1"
+
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+def write_rank_file(path: str, alternatives: list[str], rankings: Iterable[list[str]],
+                    chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Записывает бюллетени в компактный бинарный файл; возвращает их число."""
+    m = len(alternatives)
+    dtype = np.uint8 if m < 255 else np.uint16
+    empty = np.iinfo(dtype).max
+    index = {alt: i for i, alt in enumerate(alternatives)}
+    header = json.dumps({"format": RANK_FILE_MAGIC, "alternatives": alternatives,
+                         "dtype": np.dtype(dtype).name}, ensure_ascii=False)
+
+    count = 0
+    with open(path, "wb") as f:
+        f.write(header.encode("utf-8") + b"\n")
+        buffer = np.full((chunk_rows, m), empty, dtype=dtype)
+        filled = 0
+        for ranking in rankings:
+            buffer[filled] = empty
+            buffer[filled, :len(ranking)] = [index[alt] for alt in ranking]
+            filled += 1
+            if filled == chunk_rows:
+                f.write(buffer.tobytes())
+                count += filled
+                filled = 0
+        f.write(buffer[:filled].tobytes())
+        count += filled
+    return count
+
+
+def _read_rank_header(path: str) -> tuple[dict, int]:
+    with open(path, "rb") as f:
+        line = f.readline()
+    header = json.loads(line)
+    if header.get("format") != RANK_FILE_MAGIC:
+        raise ValueError(f"Файл '{path}' не является бинарным файлом бюллетеней")
+    return header, len(line)
+
+
+def _positions_from_indices(indices: np.ndarray, m: int) -> np.ndarray:
+    """Переводит строки индексов альтернатив в массив мест (-1 — не ранжирована)."""
+    n = indices.shape[0]
+    valid = indices < m
+    ranks = np.cumsum(valid, axis=1) - 1
+    rows = np.broadcast_to(np.arange(n)[:, None], indices.shape)
+    positions = np.full((n, m), -1, dtype=np.int64)
+    positions[rows[valid], indices[valid].astype(np.int64)] = ranks[valid]
+    if np.count_nonzero(positions >= 0) != np.count_nonzero(valid):
+        raise ValueError("Альтернатива повторяется внутри бюллетеня")
+    return positions
+
+
+def _tally_rank_chunk(path: str, offset: int, dtype: str, alternatives: list[str],
+                      start: int, stop: int) -> IncrementalTally:
+    """Частичный подсчёт строк [start, stop) бинарного файла (в процессе-работнике)."""
+    m = len(alternatives)
+    # Отображаются только строки части; неполная последняя строка файла не читается
+    rows = np.memmap(path, dtype=dtype, mode="r", offset=offset + start * m * np.dtype(dtype).itemsize,
+                     shape=(stop - start, m))
+    return IncrementalTally.from_positions(alternatives, _positions_from_indices(np.asarray(rows), m))
+
+
+def _tally_csv_chunk(path: str, alternatives: list[str], start: int, stop: int) -> IncrementalTally:
+    """Частичный подсчёт байтового диапазона CSV-файла (в процессе-работнике)."""
+    m = len(alternatives)
+    index = {alt: i for i, alt in enumerate(alternatives)}
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(stop - start).decode("utf-8")
+    rows = [row for row in csv.reader(io.StringIO(text)) if row]
+    indices = np.full((len(rows), m), m, dtype=np.int64)
+    for v, row in enumerate(rows):
+        try:
+            indices[v, :len(row)] = [index[alt.strip()] for alt in row]
+        except KeyError as error:
+            raise ValueError(f"Неизвестная альтернатива в бюллетене: {error.args[0]}") from None
+    return IncrementalTally.from_positions(alternatives, _positions_from_indices(indices, m))
+
+
+def _csv_ranges(path: str, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Делит CSV-файл на диапазоны байтов, выровненные по границам строк."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            stop = min(f.tell(), size)
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+
+def _run_task(task: tuple) -> IncrementalTally:
+    """Выполняет задачу (функция, аргументы...) в процессе-работнике."""
+    return task[0](*task[1:])
+
+
+def aggregate_file(path: str, alternatives: list[str] | None = None,
+                   workers: int | None = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> IncrementalTally:
+    """
+    Подсчитывает файл бюллетеней по частям в пуле процессов.
+
+    Каждый работник читает только свою часть файла (отображение в память для
+    бинарного формата, байтовый диапазон для CSV) и возвращает частичный подсчёт
+    размера O(m²); частичные подсчёты объединяются по порядку. Пиковая память
+    ограничена размером части и не зависит от размера файла.
+    Для CSV (строка — бюллетень из имён альтернатив) нужен список alternatives.
+    """
+    if path.endswith(".csv"):
+        if not alternatives:
+            raise ValueError("Для CSV-файла необходимо указать список альтернатив")
+        # Средняя длина строки CSV оценивается по длине имён
+        row_bytes = sum(len(alt.encode("utf-8")) + 1 for alt in alternatives)
+        tasks = [(_tally_csv_chunk, path, alternatives, start, stop)
+                 for start, stop in _csv_ranges(path, chunk_rows * row_bytes)]
+    else:
+        header, offset = _read_rank_header(path)
+        alternatives = header["alternatives"]
+        row_size = np.dtype(header["dtype"]).itemsize * len(alternatives)
+        n = (os.path.getsize(path) - offset) // row_size if row_size else 0
+        tasks = [(_tally_rank_chunk, path, offset, header["dtype"], alternatives, start, min(start + chunk_rows, n))
+                 for start in range(0, n, chunk_rows)]
+
+    if not tasks:
+        return IncrementalTally(alternatives)
+    if workers == 1:
+        return reduce(IncrementalTally.merge, map(_run_task, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(_run_task, tasks)
+        return reduce(IncrementalTally.merge, partials)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Подсчёт голосов по большому файлу бюллетеней")
+    parser.add_argument("path", help="бинарный файл бюллетеней или CSV")
+    parser.add_argument("--alternatives", help="альтернативы через запятую (для CSV)")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="бюллетеней в части")
+    args = parser.parse_args()
+
+    alternatives = [alt.strip() for alt in args.alternatives.split(",")] if args.alternatives else None
+    tally = aggregate_file(args.path, alternatives, workers=args.workers, chunk_rows=args.chunk_rows)
+    print(f"Бюллетеней: {tally.n_voters}")
+    print(f"Голоса за 1-е место: {dict(zip(tally.names, tally.first_counts.tolist()))}")
+    print(f"Копленд: {tally.copeland_score()}")
+    if tally.complete:
+        print(f"Симпсон: {tally.simpson_score()}")
+    print(f"Борда: {tally.borda_count()}")
+    for rule, winner in tally.winners().items():
+        print(f"  {rule}: {winner}")
+
+
+if __name__ == "__main__":
+    main()
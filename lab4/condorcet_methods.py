@@ -0,0 +1,132 @@
+import numpy as np
+
+# Наибольшее число альтернатив, для которого Кемени–Янг решается точно
+KEMENY_EXACT_LIMIT = 16
+
+
+def schulze_order(matrix: np.ndarray) -> list[int]:
+    """
+    Метод Шульце: сильнейшие пути (Флойд–Уоршелл по «ширине» пути), O(m³).
+
+    matrix[a, b] — число голосов, где a выше b. Альтернативы упорядочены по
+    числу соперников, которых они побеждают по сильнейшим путям; отношение
+    Шульце транзитивно, поэтому это корректное ранжирование.
+    """
+    m = matrix.shape[0]
+    strength = np.where(matrix > matrix.T, matrix, 0)
+    np.fill_diagonal(strength, 0)
+    for k in range(m):
+        strength = np.maximum(strength, np.minimum(strength[:, k, None], strength[None, k, :]))
+    np.fill_diagonal(strength, 0)
+    wins = (strength > strength.T).sum(axis=1)
+    return [int(i) for i in np.argsort(-wins, kind="stable")]
+
+
+def ranked_pairs_order(matrix: np.ndarray) -> list[int]:
+    """
+    Метод ранжированных пар (Тайдмана), O(m⁴) в худшем случае.
+
+    Пары закрепляются по убыванию перевеса (при равенстве — по числу
+    голосов за победителя, затем по порядку альтернатив); пара пропускается,
+    если создаёт цикл. Цикл проверяется по матрице достижимости,
+    которая обновляется за O(m²) после каждой закреплённой пары.
+    """
+    m = matrix.shape[0]
+    margins = matrix - matrix.T
+    winners, losers = np.nonzero(margins > 0)
+    order = np.lexsort((losers, winners, -matrix[winners, losers], -margins[winners, losers]))
+
+    reach = np.eye(m, dtype=bool)  # reach[a, b]: из a достижима b
+    for k in order:
+        a, b = winners[k], losers[k]
+        if reach[b, a]:
+            continue
+        # Всё, что достигает a, теперь достигает всего, что достижимо из b
+        reach |= reach[:, a, None] & reach[None, b, :]
+    return [int(i) for i in np.argsort(-reach.sum(axis=1), kind="stable")]
+
+
+def kemeny_score(matrix: np.ndarray, order: list[int]) -> int:
+    """Согласие ранжирования с профилем: сумма голосов за все пары, упорядоченные как в нём."""
+    index = np.asarray(order)
+    return int(np.triu(matrix[np.ix_(index, index)], 1).sum())
+
+
+def _kemeny_exact(matrix: np.ndarray) -> list[int]:
+    """Точное решение динамическим программированием по подмножествам, O(m·2^m)."""
+    m = matrix.shape[0]
+    size = 1 << m
+    # gain[i, S] — голоса за i над всеми альтернативами множества S
+    gain = np.zeros((m, size), dtype=np.int64)
+    for bit in range(m):
+        low = 1 << bit
+        gain[:, low:2 * low] = gain[:, :low] + matrix[:, bit, None]
+
+    masks = np.arange(size)
+    popcount = np.zeros(size, dtype=np.int64)
+    for bit in range(m):
+        popcount += (masks >> bit) & 1
+
+    # best[S] — наилучшее согласие ранжирования альтернатив S; choice[S] — кто первый
+    best = np.zeros(size, dtype=np.int64)
+    choice = np.zeros(size, dtype=np.int64)
+    for layer in range(1, m + 1):
+        subset = masks[popcount == layer]
+        layer_best = np.full(subset.size, np.iinfo(np.int64).min)
+        layer_choice = np.zeros(subset.size, dtype=np.int64)
+        for i in range(m):
+            bit = 1 << i
+            has_i = (subset & bit) != 0
+            rest = subset[has_i] ^ bit
+            value = gain[i, rest] + best[rest]
+            better = value > layer_best[has_i]
+            positions = np.flatnonzero(has_i)[better]
+            layer_best[positions] = value[better]
+            layer_choice[positions] = i
+        best[subset] = layer_best
+        choice[subset] = layer_choice
+
+    order = []
+    mask = size - 1
+    while mask:
+        i = int(choice[mask])
+        order.append(i)
+        mask ^= 1 << i
+    return order
+
+
+def _kemeny_local_search(matrix: np.ndarray, start: list[int]) -> list[int]:
+    """Локальный поиск перестановками вставки: O(m²) на проход, до отсутствия улучшений."""
+    order = list(start)
+    improved = True
+    while improved:
+        improved = False
+        for x in list(order):
+            rest = [y for y in order if y != x]
+            above = matrix[rest, x]   # голоса за соперника над x
+            below = matrix[x, rest]   # голоса за x над соперником
+            # Вклад x при вставке на позицию t: соперники до t выше x, после — ниже
+            contribution = np.concatenate(([0], np.cumsum(above))) + \
+                np.concatenate((np.cumsum(below[::-1])[::-1], [0]))
+            current = order.index(x)
+            target = int(np.argmax(contribution))
+            if contribution[target] > contribution[current]:
+                order = rest[:target] + [x] + rest[target:]
+                improved = True
+    return order
+
+
+def kemeny_order(matrix: np.ndarray) -> list[int]:
+    """
+    Метод Кемени–Янга: ранжирование с наибольшим согласием с профилем.
+
+    До KEMENY_EXACT_LIMIT альтернатив — точное решение O(m·2^m);
+    для больших m — локальный поиск от ранжирования Копленда.
+    """
+    m = matrix.shape[0]
+    if m == 0:
+        return []
+    if m <= KEMENY_EXACT_LIMIT:
+        return _kemeny_exact(matrix)
+    copeland = np.sign(matrix - matrix.T).sum(axis=1)
+    return _kemeny_local_search(matrix, [int(i) for i in np.argsort(-copeland, kind="stable")])
@@ -1,12 +1,73 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from models import (
-    relative_majority,
-    condorcet_winner,
-    copeland_score,
-    simpson_score,
-    borda_count
-)
+import tkinter.font as tkfont
+from collections.abc import Callable
+from tkinter import ttk, messagebox, simpledialog, filedialog
+from batch import evaluate, load_election
+from profile_engine import PairwiseTally, Profile, ProfileEngine
+from tally import IncrementalTally
+
+
+class VirtualList(ttk.Frame):
+    """
+    Список строк, который рисует только видимые строки.
+
+    Текст строки запрашивается функцией row_text(i) при отрисовке, поэтому
+    стоимость прокрутки и обновления не зависит от общего числа строк.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.font = tkfont.nametofont("TkFixedFont")
+        self.row_height = self.font.metrics("linespace") + 2
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.count = 0
+        self.first = 0
+        self.row_text: Callable[[int], str] = lambda i: ""
+        self.items: list[int] = []  # переиспользуемые текстовые элементы холста
+
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll_to(self.first - event.delta // 120 * 3))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_to(self.first - 3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_to(self.first + 3))
+
+    def set_rows(self, count: int, row_text: Callable[[int], str]):
+        self.count = count
+        self.row_text = row_text
+        self.scroll_to(self.first)
+
+    def visible_rows(self) -> int:
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def scroll_to(self, first: int):
+        self.first = max(0, min(first, self.count - self.visible_rows()))
+        self.render()
+
+    def on_scroll(self, action: str, value: str, unit: str | None = None):
+        if action == "moveto":
+            self.scroll_to(round(float(value) * self.count))
+        elif unit == "pages":
+            self.scroll_to(self.first + int(value) * self.visible_rows())
+        else:
+            self.scroll_to(self.first + int(value))
+
+    def render(self):
+        visible = self.visible_rows()
+        while len(self.items) < visible:
+            y = len(self.items) * self.row_height
+            self.items.append(self.canvas.create_text(4, y, anchor=tk.NW, font=self.font))
+        for k, item in enumerate(self.items):
+            row = self.first + k
+            self.canvas.itemconfigure(item, text=self.row_text(row) if k < visible and row < self.count else "")
+        if self.count:
+            self.scrollbar.set(self.first / self.count, min(1.0, (self.first + visible) / self.count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
 
 class CollectiveDecisionApp:
@@ -19,6 +80,11 @@ class CollectiveDecisionApp:
         self.alternatives: list[str] = []
         self.voters: list[str] = []
         self.profile: list[list[str]] = []
+        # Сводка профиля; при ручном голосовании обновляется с каждым бюллетенем
+        self.tally: PairwiseTally | None = None
+        # Сообщения фонового подсчёта для главного потока Tk
+        self.results_queue: queue.Queue = queue.Queue()
+        self.worker: threading.Thread | None = None
 
         self.create_widgets()
 
@@ -30,6 +96,14 @@ class CollectiveDecisionApp:
         ttk.Button(frame_top, text="Добавить избирателя", command=self.add_voter).pack(side=tk.LEFT, padx=5)
         ttk.Button(frame_top, text="Провести голосование", command=self.collect_votes).pack(side=tk.LEFT, padx=5)
         ttk.Button(frame_top, text="Показать результаты", command=self.show_results).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_top, text="Загрузить из файла", command=self.load_file).pack(side=tk.LEFT, padx=5)
+
+        frame_status = ttk.Frame(self.root, padding=(10, 0))
+        frame_status.pack(fill=tk.X)
+        self.progress = ttk.Progressbar(frame_status, mode="determinate", length=200)
+        self.progress.pack(side=tk.LEFT)
+        self.status_label = ttk.Label(frame_status, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
 
         ttk.Label(self.root, text="Варианты голосования:").pack(anchor=tk.W, padx=10, pady=(10, 0))
         self.alternatives_listbox = tk.Listbox(self.root, height=6)
@@ -40,8 +114,8 @@ class CollectiveDecisionApp:
         self.voters_listbox.pack(fill=tk.X, padx=10, pady=5)
 
         ttk.Label(self.root, text="Профиль голосования:").pack(anchor=tk.W, padx=10)
-        self.profile_text = tk.Text(self.root, height=10)
-        self.profile_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.profile_view = VirtualList(self.root)
+        self.profile_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
     def add_alternative(self):
         alt = simpledialog.askstring("Новый вариант", "Введите вариант для голосования:")
@@ -72,13 +146,40 @@ class CollectiveDecisionApp:
             return
 
         self.profile = []
+        self.tally = IncrementalTally(self.alternatives)
         for voter in self.voters:
             ranking = self.ask_ranking(voter, self.alternatives.copy())
             if ranking is None:
                 return
             self.profile.append(ranking)
+            self.tally.add_ballot(ranking)
+
+        self.update_profile_display()
+
+    def load_file(self):
+        path = filedialog.askopenfilename(filetypes=[("Выборы", "*.json *.csv"), ("Все файлы", "*.*")])
+        if not path:
+            return
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("Подсчёт", "Дождитесь окончания подсчёта.")
+            return
+        # Состояние меняется только после успешной загрузки; сводка строится в фоне
+        try:
+            alternatives, profile = load_election(path)
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить файл: {error}")
+            return
 
+        self.alternatives = alternatives
+        self.profile = list(profile)
+        self.voters = [f"Избиратель {i + 1}" for i in range(len(self.profile))]
+        self.tally = None
+        self.alternatives_listbox.delete(0, tk.END)
+        self.alternatives_listbox.insert(tk.END, *self.alternatives)
+        self.voters_listbox.delete(0, tk.END)
+        self.voters_listbox.insert(tk.END, *self.voters)
         self.update_profile_display()
+        self.start_worker(None, profile, alternatives, report=False)
 
     def ask_ranking(self, voter_name: str, alts: list[str]) -> list[str] | None:
         """Показывает диалог для ранжирования альтернатив."""
@@ -119,45 +220,116 @@ class CollectiveDecisionApp:
         return result[0] if result else None
 
     def update_profile_display(self):
-        self.profile_text.delete(1.0, tk.END)
-        for i, ranking in enumerate(self.profile):
-            voter = self.voters[i]
-            self.profile_text.insert(tk.END, f"{voter}: {ranking}\n")
+        self.profile_view.set_rows(len(self.profile), lambda i: f"{self.voters[i]}: {self.profile[i]}")
 
     def show_results(self):
         if not self.profile or not self.alternatives:
             messagebox.showerror("Ошибка", "Нет данных для анализа.")
             return
 
-        maj_winner, maj_counts = relative_majority(self.profile, self.alternatives)
-        cond_winner = condorcet_winner(self.profile, self.alternatives)
-        cop_scores = copeland_score(self.profile, self.alternatives)
-        cop_winner = max(cop_scores, key=cop_scores.get)
-        sim_scores = simpson_score(self.profile, self.alternatives)
-        sim_winner = max(sim_scores, key=sim_scores.get)
-        bor_scores = borda_count(self.profile, self.alternatives)
-        bor_winner = max(bor_scores, key=bor_scores.get)
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("Подсчёт", "Подсчёт ещё выполняется.")
+            return
+
+        # Фоновый поток получает неизменяемую копию сводки; Tk опрашивает очередь
+        if self.tally is not None and self.tally.alternatives == self.alternatives:
+            self.start_worker(self.tally.snapshot(), None, list(self.alternatives))
+        else:
+            # После добавления вариантов сводка пересобирается по профилю
+            self.tally = None
+            self.start_worker(None, list(self.profile), list(self.alternatives))
+
+    def start_worker(self, tally: PairwiseTally | None, profile: Profile | None, alternatives: list[str],
+                     report: bool = True):
+        self.progress.configure(value=0, maximum=1)
+        self.status_label.configure(text="Подсчёт..." if report else "Загрузка...")
+        self.worker = threading.Thread(
+            target=self.compute_results, args=(tally, profile, alternatives, report), daemon=True
+        )
+        self.worker.start()
+        self.root.after(50, self.poll_results)
+
+    def compute_results(self, tally: PairwiseTally | None, profile: Profile | None, alternatives: list[str],
+                        report: bool):
+        """Выполняется в фоновом потоке; не обращается к виджетам."""
+        try:
+            if tally is None:
+                tally = ProfileEngine(profile, alternatives)
+                self.results_queue.put(("tally", tally))
+            if not report:
+                self.results_queue.put(("loaded",))
+                return
+            results = evaluate(tally, progress=lambda done, total: self.results_queue.put(("progress", done, total)))
+            self.results_queue.put(("done", results))
+        except Exception as error:
+            self.results_queue.put(("error", error))
+
+    def poll_results(self):
+        while True:
+            try:
+                message = self.results_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(50, self.poll_results)
+                return
+            kind = message[0]
+            if kind == "tally":
+                # Сводка устарела, если профиль успели собрать заново
+                if self.tally is None:
+                    self.tally = message[1]
+            elif kind == "loaded":
+                self.status_label.configure(text="Загружено")
+                return
+            elif kind == "progress":
+                _, done, total = message
+                self.progress.configure(value=done, maximum=total)
+                self.status_label.configure(text=f"Правил вычислено: {done} из {total}")
+            elif kind == "error":
+                self.status_label.configure(text="")
+                messagebox.showerror("Ошибка", f"Не удалось выполнить подсчёт: {message[1]}")
+                return
+            else:
+                self.status_label.configure(text="Готово")
+                self.show_report(message[1])
+                return
+
+    def show_report(self, results: dict[str, dict]):
+        maj = results["relative_majority"]
+        cond_winner = results["condorcet"]["winner"]
+        cop, sim, bor = results["copeland"], results["simpson"], results["borda"]
+        sch, rp, kem = results["schulze"], results["ranked_pairs"], results["kemeny"]
 
         report = f"""РЕЗУЛЬТАТЫ ГОЛОСОВАНИЯ
 
 1. Относительное большинство:
-   Победитель: {maj_winner}
-   Голоса за 1-е место: {maj_counts}
+   Победитель: {maj['winner']}
+   Голоса за 1-е место: {maj.get('counts', {})}
 
 2. Победитель по Кондорсе:
    {'Найден: ' + cond_winner if cond_winner else 'Отсутствует (парадокс Кондорсе)'}
 
 3. Правило Копленда:
-   Очки: {cop_scores}
-   Победитель: {cop_winner}
+   Очки: {cop['scores']}
+   Победитель: {cop['winner']}
 
 4. Правило Симпсона:
-   Мин. поддержка: {sim_scores}
-   Победитель: {sim_winner}
+   Мин. поддержка: {sim['scores']}
+   Победитель: {sim['winner']}
 
 5. Модель Борда:
-   Очки: {bor_scores}
-   Победитель: {bor_winner}
+   Очки: {bor['scores']}
+   Победитель: {bor['winner']}
+
+6. Метод Шульце:
+   Ранжирование: {sch['ranking']}
+   Победитель: {sch['winner']}
+
+7. Метод ранжированных пар:
+   Ранжирование: {rp['ranking']}
+   Победитель: {rp['winner']}
+
+8. Метод Кемени–Янга:
+   Ранжирование: {kem['ranking']}
+   Победитель: {kem['winner']}
 """
 
         result_window = tk.Toplevel(self.root)
@@ -0,0 +1,369 @@
+from collections.abc import Collection, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from condorcet_methods import kemeny_order, ranked_pairs_order, schulze_order
+
+# Максимальный размер промежуточного массива n×m×m при построении матрицы
+_CHUNK_ELEMENTS = 1 << 22
+
+# Бюллетень: альтернативы по убыванию предпочтения. Элемент может быть группой
+# равноценных альтернатив (кортеж/список/множество) — слабый порядок;
+# неупомянутые альтернативы не ранжированы (усечённый бюллетень).
+Ballot = Sequence[str | Collection[str]]
+
+
+def normalize_ballot(ranking: Ballot) -> tuple[str | tuple[str, ...], ...]:
+    """Хешируемая запись бюллетеня: группы — кортежи, группа из одной альтернативы — строка."""
+    entries = []
+    for entry in ranking:
+        if isinstance(entry, str):
+            entries.append(entry)
+            continue
+        group = tuple(entry)
+        if len(group) == 1:
+            entries.append(group[0])
+        elif group:
+            entries.append(group)
+    return tuple(entries)
+
+
+def ballot_groups(ranking: Ballot) -> list[tuple[str, ...]]:
+    """Группы равноценных альтернатив по уровням бюллетеня (уровень — номер группы)."""
+    return [(entry,) if isinstance(entry, str) else tuple(entry) for entry in normalize_ballot(ranking)]
+
+
+def as_number(value: float) -> int | float:
+    """Целые значения возвращаются как int, дробные (из-за равенств) — как float."""
+    value = float(value)
+    rounded = round(value)
+    return int(rounded) if abs(value - rounded) < 1e-9 else round(value, 9)
+
+
+class CompressedProfile:
+    """
+    Сжатый профиль: каждое различное ранжирование хранится один раз с числом голосов.
+
+    Память и время подсчёта зависят от числа различных бюллетеней, а не избирателей.
+    Порядок ранжирований — порядок их первого появления.
+    """
+
+    def __init__(self, ballots: dict[tuple, int] | None = None):
+        self._counts: dict[tuple, int] = {}
+        for ranking, count in (ballots or {}).items():
+            self.add(ranking, count)
+
+    @classmethod
+    def from_rankings(cls, rankings: Iterable[Ballot]) -> "CompressedProfile":
+        """Сжимает обычный профиль (список ранжирований)."""
+        profile = cls()
+        for ranking in rankings:
+            profile.add(ranking)
+        return profile
+
+    def add(self, ranking: Ballot, count: int = 1):
+        """Добавляет count одинаковых бюллетеней."""
+        if count < 0:
+            raise ValueError("Число голосов не может быть отрицательным")
+        key = normalize_ballot(ranking)
+        self._counts[key] = self._counts.get(key, 0) + count
+
+    def remove(self, ranking: Ballot, count: int = 1):
+        """Убирает count ранее добавленных одинаковых бюллетеней."""
+        if count < 0:
+            raise ValueError("Число голосов не может быть отрицательным")
+        key = normalize_ballot(ranking)
+        if self._counts.get(key, 0) < count:
+            raise ValueError("Нельзя убрать бюллетени, которые не были добавлены")
+        self._counts[key] -= count
+
+    def items(self) -> list[tuple[tuple, int]]:
+        """Пары (ранжирование, число голосов) для различных ранжирований."""
+        return [(ranking, count) for ranking, count in self._counts.items() if count]
+
+    @property
+    def n_distinct(self) -> int:
+        """Число различных ранжирований."""
+        return sum(1 for count in self._counts.values() if count)
+
+    def __len__(self) -> int:
+        """Число избирателей."""
+        return sum(self._counts.values())
+
+    def __iter__(self) -> Iterator[list]:
+        """Разворачивает профиль в отдельные бюллетени (для совместимости)."""
+        for ranking, count in self.items():
+            for _ in range(count):
+                yield list(ranking)
+
+
+Profile = list[Ballot] | CompressedProfile
+
+
+def weighted_ballots(profile: Profile) -> list[tuple[tuple, int]]:
+    """Различные бюллетени с весами в порядке первого появления."""
+    if isinstance(profile, CompressedProfile):
+        return profile.items()
+    return CompressedProfile.from_rankings(profile).items()
+
+
+def pairwise_matrix(positions: np.ndarray, weights: np.ndarray | None = None) -> np.ndarray:
+    """
+    Матрица попарного большинства по массиву уровней.
+
+    positions[v, i] — уровень альтернативы i в бюллетене v (-1, если её нет;
+    равные уровни — равноценные альтернативы), weights[v] — число избирателей
+    с таким бюллетенем (по умолчанию 1).
+    Элемент [a, b] — число голосов, где a стоит строго выше b (оба присутствуют).
+    """
+    n, m = positions.shape
+    if weights is None:
+        weights = np.ones(n, dtype=np.int64)
+    matrix = np.zeros((m, m), dtype=np.int64)
+    chunk = max(1, _CHUNK_ELEMENTS // max(1, m * m))
+    for start in range(0, n, chunk):
+        block = positions[start:start + chunk]
+        present = block >= 0
+        above = block[:, :, None] < block[:, None, :]
+        above &= present[:, :, None]
+        above &= present[:, None, :]
+        matrix += np.tensordot(weights[start:start + chunk], above, axes=1)
+    return matrix
+
+
+def positional_scores(positions: np.ndarray, weights: np.ndarray, p: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Число первых мест и суммы Борда по массиву уровней.
+
+    Для строгих бюллетеней уровень равен месту: Борда даёт p-1-место очков.
+    Группа из t равноценных альтернатив, над которой стоят k альтернатив,
+    делит места k..k+t-1: каждая получает среднее p-1-k-(t-1)/2, а при
+    равенстве на 1-м месте — долю 1/t первого места.
+    """
+    present = positions >= 0
+    first = (positions == 0).astype(float)
+    points = np.where(present, p - 1 - positions, 0).astype(float)
+
+    ordered = np.sort(positions, axis=1)
+    tied_rows = np.flatnonzero(((ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] >= 0)).any(axis=1))
+    m = positions.shape[1]
+    chunk = max(1, _CHUNK_ELEMENTS // max(1, m * m))
+    for start in range(0, tied_rows.size, chunk):
+        rows = tied_rows[start:start + chunk]
+        block = positions[rows]
+        block_present = block >= 0
+        # higher[v, i] — сколько альтернатив выше i, equal[v, i] — размер группы i
+        higher = ((block[:, None, :] < block[:, :, None]) & block_present[:, None, :]).sum(axis=2)
+        equal = np.maximum(((block[:, None, :] == block[:, :, None]) & block_present[:, None, :]).sum(axis=2), 1)
+        points[rows] = np.where(block_present, p - 1 - higher - (equal - 1) / 2, 0)
+        first[rows] = np.where(block == 0, 1 / equal, 0)
+    return weights @ first, weights @ points
+
+
+class PairwiseTally:
+    """
+    Сводка профиля, по которой вычисляются все правила.
+
+    Хранит матрицу попарного большинства matrix[a, b] (число голосов, где
+    a стоит строго выше b), число первых мест, суммы Борда и число
+    избирателей, ранжировавших каждую альтернативу. Правила выводятся из
+    этих массивов за O(m²), независимо от числа избирателей.
+
+    Попарные правила учитывают только пары, ранжированные в бюллетене обеими
+    альтернативами; равноценные альтернативы не дают голоса ни одной из них.
+    Позиционные правила делят места равноценных альтернатив поровну
+    (см. positional_scores), поэтому очки могут быть дробными.
+
+    Первые len(alternatives) индексов соответствуют alternatives; далее
+    идут имена, встретившиеся в бюллетенях, но не входящие в alternatives.
+    """
+
+    def __init__(self, alternatives: list[str]):
+        self.alternatives = list(alternatives)
+        self.names = list(self.alternatives)
+        self.name_index = {alt: i for i, alt in enumerate(self.names)}
+        m = len(self.names)
+        self.matrix = np.zeros((m, m), dtype=np.int64)
+        self.first_counts = np.zeros(m)
+        self.borda_totals = np.zeros(m)
+        self.present_counts = np.zeros(m, dtype=np.int64)
+        self.n_voters = 0
+        self.n_incomplete = 0  # бюллетени, где ранжированы не все альтернативы
+        self.n_empty = 0       # пустые бюллетени
+        # Порядок ключей в словарях результатов (определяет выбор при равенстве)
+        self._first_order: list[int] = []  # первое появление на 1-м месте
+        self._borda_order: list[int] = []  # первое появление в бюллетенях
+
+    @property
+    def complete(self) -> bool:
+        """Все бюллетени ранжируют все альтернативы."""
+        return self.n_incomplete == 0
+
+    def pairwise_comparison(self, a: str, b: str) -> int:
+        """Сколько предпочитают a над b минус наоборот."""
+        if a not in self.name_index or b not in self.name_index:
+            return 0
+        i, j = self.name_index[a], self.name_index[b]
+        if i == j:
+            # Совпадает с исходной функцией: «a выше a» не выполняется ни в одном бюллетене
+            return -int(self.present_counts[i])
+        return int(self.matrix[i, j] - self.matrix[j, i])
+
+    def relative_majority(self) -> tuple[str, dict[str, int | float]]:
+        """Относительное большинство: побеждает тот, кто чаще стоит на 1-м месте."""
+        if self.n_empty:
+            raise IndexError("Пустой бюллетень: нет кандидата на 1-м месте")
+        counts = {self.names[i]: as_number(self.first_counts[i]) for i in self._first_order}
+        counts = {alt: count for alt, count in counts.items() if count}
+        winner = max(counts, key=counts.get)
+        return winner, counts
+
+    def condorcet_winner(self) -> str | None:
+        """Явный победитель Кондорсе: побеждает всех в попарных сравнениях."""
+        m = len(self.alternatives)
+        margins = self.matrix[:m, :m] - self.matrix[:m, :m].T
+        beats_all = ((margins > 0) | np.eye(m, dtype=bool)).all(axis=1)
+        winners = np.flatnonzero(beats_all)
+        return self.alternatives[winners[0]] if winners.size else None
+
+    def copeland_score(self) -> dict[str, int]:
+        """Правило Копленда: +1 за победу, -1 за поражение, 0 за ничью."""
+        m = len(self.alternatives)
+        margins = self.matrix[:m, :m] - self.matrix[:m, :m].T
+        scores = np.sign(margins).sum(axis=1)
+        return {alt: int(scores[i]) for i, alt in enumerate(self.alternatives)}
+
+    def simpson_score(self) -> dict[str, int]:
+        """Правило Симпсона: минимальное число голосов, с которым кандидат побеждает любого другого."""
+        m = len(self.alternatives)
+        wins = self.matrix[:m, :m].astype(float)
+        np.fill_diagonal(wins, np.inf)
+        minima = wins.min(axis=1) if m else wins
+        return {
+            alt: (int(minima[i]) if np.isfinite(minima[i]) else float('inf'))
+            for i, alt in enumerate(self.alternatives)
+        }
+
+    def borda_count(self) -> dict[str, int | float]:
+        """Модель Борда: p-1 очков за 1-е место, ..., 0 за последнее."""
+        return {self.names[i]: as_number(self.borda_totals[i]) for i in self._borda_order}
+
+    def _alternatives_matrix(self) -> np.ndarray:
+        m = len(self.alternatives)
+        return self.matrix[:m, :m]
+
+    def schulze_ranking(self) -> list[str]:
+        """Метод Шульце: ранжирование по сильнейшим путям."""
+        return [self.alternatives[i] for i in schulze_order(self._alternatives_matrix())]
+
+    def ranked_pairs_ranking(self) -> list[str]:
+        """Метод ранжированных пар: закрепление пар по убыванию перевеса без циклов."""
+        return [self.alternatives[i] for i in ranked_pairs_order(self._alternatives_matrix())]
+
+    def kemeny_ranking(self) -> list[str]:
+        """Метод Кемени–Янга: ранжирование, наиболее согласованное с профилем."""
+        return [self.alternatives[i] for i in kemeny_order(self._alternatives_matrix())]
+
+    def snapshot(self) -> "PairwiseTally":
+        """
+        Копия сводки за O(m²) с массивами только для чтения.
+
+        Бюллетени и массивы мест не копируются; результаты всех правил
+        совпадают с исходным подсчётом, пока тот не изменится.
+        """
+        copy = PairwiseTally(self.alternatives)
+        copy.names = list(self.names)
+        copy.name_index = dict(self.name_index)
+        for attr in ("matrix", "first_counts", "borda_totals", "present_counts"):
+            array = getattr(self, attr).copy()
+            array.setflags(write=False)
+            setattr(copy, attr, array)
+        copy.n_voters, copy.n_incomplete, copy.n_empty = self.n_voters, self.n_incomplete, self.n_empty
+        copy._first_order = list(self._first_order)
+        # Порядок ключей Борда берётся у подсчёта: IncrementalTally дополняет его
+        copy._borda_order = [self.name_index[name] for name in self.borda_count()]
+        return copy
+
+    def winner(self, rule: str) -> str | None:
+        """Победитель по правилу из WINNER_RULES (None — победитель не определён)."""
+        return WINNER_RULES[rule](self)
+
+    def winners(self) -> dict[str, str | None]:
+        """Победители по всем правилам (None — победитель не определён)."""
+        return {rule: self.winner(rule) for rule in WINNER_RULES}
+
+
+def _best(scores: dict) -> str | None:
+    return max(scores, key=scores.get) if scores else None
+
+
+# Победитель по каждому правилу, вычисляемый по сводке профиля
+WINNER_RULES = {
+    "relative_majority": lambda tally: (
+        tally.relative_majority()[0] if tally.n_voters and not tally.n_empty else None
+    ),
+    "condorcet": lambda tally: tally.condorcet_winner(),
+    "copeland": lambda tally: _best(tally.copeland_score()),
+    "simpson": lambda tally: _best(tally.simpson_score()),
+    "borda": lambda tally: _best(tally.borda_count()),
+    "schulze": lambda tally: next(iter(tally.schulze_ranking()), None),
+    "ranked_pairs": lambda tally: next(iter(tally.ranked_pairs_ranking()), None),
+    "kemeny": lambda tally: next(iter(tally.kemeny_ranking()), None),
+}
+
+
+class ProfileEngine(PairwiseTally):
+    """
+    Профиль голосования, один раз переведённый в массивы уровней.
+
+    Одинаковые бюллетени объединяются: строка массива мест соответствует
+    различному ранжированию, а его вес — числу поданных за него голосов.
+
+    Матрица попарного большинства, число первых мест и суммы Борда
+    вычисляются за один проход; все правила выводятся из них.
+    Результаты совпадают с функциями models.py, включая порядок ключей
+    в словарях (он определяет выбор победителя при равенстве через max).
+    """
+
+    def __init__(self, profile: Profile, alternatives: list[str]):
+        super().__init__(alternatives)
+        name_index = self.name_index
+
+        first_seen: dict[int, None] = {}    # порядок первого появления в бюллетенях
+        first_choices: dict[int, None] = {}  # порядок первого появления на 1-м месте
+        rows = []
+        counts = []
+        for ranking, count in weighted_ballots(profile):
+            row = {}
+            for level, group in enumerate(ballot_groups(ranking)):
+                for alt in group:
+                    i = name_index.get(alt)
+                    if i is None:
+                        i = name_index[alt] = len(self.names)
+                        self.names.append(alt)
+                    row.setdefault(i, level)
+                    first_seen.setdefault(i, None)
+                    if level == 0:
+                        first_choices.setdefault(i, None)
+            rows.append(row)
+            counts.append(count)
+
+        self.weights = np.array(counts, dtype=np.int64)
+        self.n_voters = int(self.weights.sum())
+        self.positions = np.full((len(rows), len(self.names)), -1, dtype=np.int64)
+        for v, row in enumerate(rows):
+            self.positions[v, list(row)] = list(row.values())
+
+        present = self.positions >= 0
+        self.n_incomplete = int(self.weights[~present[:, :len(self.alternatives)].all(axis=1)].sum())
+        self.n_empty = int(self.weights[~present.any(axis=1)].sum())
+        self.present_counts = self.weights @ present
+        self.matrix = pairwise_matrix(self.positions, self.weights)
+        self.first_counts, self.borda_totals = positional_scores(
+            self.positions, self.weights, len(self.alternatives)
+        )
+
+        self._first_order = list(first_choices)
+        self._borda_order = list(first_seen) + [
+            i for i in range(len(self.alternatives)) if i not in first_seen
+        ]
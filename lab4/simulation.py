@@ -0,0 +1,154 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, product
+
+import numpy as np
+
+from profile_engine import WINNER_RULES
+from tally import IncrementalTally
+
+
+def impartial_culture(rng: np.random.Generator, voters: int, m: int) -> np.ndarray:
+    """Импартиальная культура: все m! ранжирований равновероятны. Возвращает массив мест."""
+    return rng.random((voters, m)).argsort(axis=1).argsort(axis=1)
+
+
+def mallows(rng: np.random.Generator, voters: int, m: int, phi: float) -> np.ndarray:
+    """
+    Модель Мэллоуза с центральным ранжированием 0, 1, ..., m-1 и дисперсией phi ∈ (0, 1].
+
+    Метод повторяющихся вставок для всех избирателей сразу: альтернатива i
+    вставляется на место j ∈ [0, i] с вероятностью ∝ phi^(i-j).
+    """
+    positions = np.zeros((voters, m), dtype=np.int64)
+    for i in range(1, m):
+        weights = phi ** (i - np.arange(i + 1))
+        slot = np.searchsorted(np.cumsum(weights / weights.sum()), rng.random(voters), side="right")
+        slot = np.minimum(slot, i)
+        placed = positions[:, :i]
+        placed += placed >= slot[:, None]
+        positions[:, i] = slot
+    return positions
+
+
+def polya_eggenberger(rng: np.random.Generator, voters: int, m: int, alpha: float) -> np.ndarray:
+    """
+    Урновая модель Пойа–Эггенбергера с параметром заразности alpha.
+
+    Избиратель k с вероятностью k·alpha / (1 + k·alpha) повторяет бюллетень
+    случайного предыдущего избирателя, иначе берёт новое случайное ранжирование.
+    Цепочки повторов разрешаются удвоением указателей за O(log n) шагов.
+    """
+    k = np.arange(voters)
+    copies = rng.random(voters) < k * alpha / (1 + k * alpha)
+    source = np.where(copies, (rng.random(voters) * np.maximum(k, 1)).astype(np.int64), k)
+    while True:
+        next_source = source[source]
+        if np.array_equal(next_source, source):
+            break
+        source = next_source
+    return impartial_culture(rng, voters, m)[source]
+
+
+MODELS = {
+    "ic": lambda rng, voters, m, params: impartial_culture(rng, voters, m),
+    "mallows": lambda rng, voters, m, params: mallows(rng, voters, m, params["phi"]),
+    "urn": lambda rng, voters, m, params: polya_eggenberger(rng, voters, m, params["alpha"]),
+}
+
+
+def simulate(model: str, voters: int, m: int, trials: int, seed: int = 0,
+             params: dict | None = None, rules: list[str] | None = None) -> dict:
+    """
+    Прогоняет правила на trials случайных профилях.
+
+    Возвращает winners (победители по правилам в каждом испытании),
+    paradox_rate (доля профилей без победителя Кондорсе) и runtime
+    (среднее время правила, с; ключ "profile" — построение сводки профиля).
+    """
+    params = {"phi": 0.8, "alpha": 0.1, **(params or {})}
+    rules = rules or list(WINNER_RULES)
+    rng = np.random.default_rng(seed)
+    alternatives = [f"a{i}" for i in range(m)]
+    winners = {rule: [] for rule in rules}
+    runtime = {rule: 0.0 for rule in ["profile", *rules]}
+    paradoxes = 0
+
+    for _ in range(trials):
+        positions = MODELS[model](rng, voters, m, params)
+        start = time.perf_counter()
+        tally = IncrementalTally.from_positions(alternatives, positions)
+        runtime["profile"] += time.perf_counter() - start
+        for rule in rules:
+            start = time.perf_counter()
+            winners[rule].append(tally.winner(rule))
+            runtime[rule] += time.perf_counter() - start
+        if tally.condorcet_winner() is None:
+            paradoxes += 1
+
+    return {
+        "model": model, "voters": voters, "alternatives": m, "trials": trials,
+        "winners": winners,
+        "paradox_rate": paradoxes / trials if trials else 0.0,
+        "runtime": {rule: total / trials if trials else 0.0 for rule, total in runtime.items()},
+    }
+
+
+def agreement(winners: dict[str, list]) -> dict[tuple[str, str], float]:
+    """Доля испытаний, в которых правила выбрали одного победителя."""
+    rates = {}
+    for a, b in combinations(winners, 2):
+        pairs = list(zip(winners[a], winners[b]))
+        rates[(a, b)] = sum(x == y for x, y in pairs) / len(pairs) if pairs else 0.0
+    return rates
+
+
+def _simulate_task(task: tuple) -> dict:
+    return simulate(*task)
+
+
+def sweep(model: str, voters_grid: list[int], m_grid: list[int], trials: int,
+          seed: int = 0, params: dict | None = None, workers: int | None = 1) -> list[dict]:
+    """Перебор сетки (избиратели × альтернативы); workers > 1 — параллельно в пуле процессов."""
+    tasks = [(model, voters, m, trials, seed + i, params)
+             for i, (voters, m) in enumerate(product(voters_grid, m_grid))]
+    if workers == 1:
+        return [_simulate_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_simulate_task, tasks))
+
+
+def print_report(result: dict):
+    """Печатает сводку одного прогона."""
+    print(f"\nМодель {result['model']}: избирателей {result['voters']}, "
+          f"альтернатив {result['alternatives']}, испытаний {result['trials']}")
+    print(f"  Частота парадокса Кондорсе: {result['paradox_rate']:.3f}")
+    print("  Среднее время, мс:")
+    for rule, seconds in result["runtime"].items():
+        print(f"    {rule:<18} {seconds * 1000:9.3f}")
+    print("  Согласие победителей:")
+    for (a, b), rate in agreement(result["winners"]).items():
+        print(f"    {a} / {b}: {rate:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Моделирование выборов методом Монте-Карло")
+    parser.add_argument("--model", choices=list(MODELS), default="ic")
+    parser.add_argument("--voters", type=int, nargs="+", default=[101])
+    parser.add_argument("--alternatives", type=int, nargs="+", default=[4])
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--phi", type=float, default=0.8, help="дисперсия модели Мэллоуза")
+    parser.add_argument("--alpha", type=float, default=0.1, help="заразность урновой модели")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="число процессов для перебора сетки")
+    args = parser.parse_args()
+
+    results = sweep(args.model, args.voters, args.alternatives, args.trials, args.seed,
+                    {"phi": args.phi, "alpha": args.alpha}, args.workers)
+    for result in results:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import numpy as np
+
+from profile_engine import (
+    Ballot, CompressedProfile, PairwiseTally, Profile, as_number, ballot_groups, pairwise_matrix,
+    positional_scores, weighted_ballots
+)
+
+
+class IncrementalTally(PairwiseTally):
+    """
+    Подсчёт голосов в реальном времени.
+
+    Добавление и отзыв бюллетеня обновляют матрицу попарного большинства,
+    число первых мест и суммы Борда за O(m²); победитель по любому правилу
+    доступен в любой момент за O(m²). Подсчёты, выполненные на разных
+    частях (шардах) голосования, объединяются через merge.
+
+    Бюллетени, добавленные через add_ballot, запоминаются в сжатом виде, и
+    отозвать можно только их. Подсчёт, построенный через from_positions
+    (или объединённый с таким), отдельных бюллетеней не хранит: при отзыве
+    проверяется лишь, что ни один счётчик не станет отрицательным.
+    """
+
+    def __init__(self, alternatives: list[str]):
+        super().__init__(alternatives)
+        self._first_seen: set[int] = set()
+        self._borda_seen: set[int] = set()
+        # Учтённые бюллетени; None — состав неизвестен (подсчёт по массиву мест)
+        self._ballots: CompressedProfile | None = CompressedProfile()
+
+    @classmethod
+    def from_profile(cls, profile: Profile, alternatives: list[str]) -> "IncrementalTally":
+        """Подсчёт по уже собранному профилю."""
+        tally = cls(alternatives)
+        for ranking, count in weighted_ballots(profile):
+            tally.add_ballot(ranking, count)
+        return tally
+
+    @classmethod
+    def from_positions(cls, alternatives: list[str], positions: np.ndarray,
+                       weights: np.ndarray | None = None) -> "IncrementalTally":
+        """
+        Векторизованный подсчёт по массиву уровней.
+
+        positions[v, i] — уровень альтернативы i в бюллетене v (-1 — не ранжирована,
+        равные уровни — равноценные альтернативы).
+        Порядок первого появления альтернатив совпадает с построчным подсчётом.
+        """
+        tally = cls(alternatives)
+        tally._ballots = None
+        n, m = positions.shape
+        if m != len(tally.names):
+            raise ValueError("Число столбцов массива мест не совпадает с числом альтернатив")
+        if weights is None:
+            weights = np.ones(n, dtype=np.int64)
+        present = positions >= 0
+        first = positions == 0
+
+        tally.matrix = pairwise_matrix(positions, weights)
+        tally.first_counts, tally.borda_totals = positional_scores(positions, weights, m)
+        tally.present_counts = weights @ present
+        tally.n_voters = int(weights.sum())
+        tally.n_incomplete = int(weights[~present.all(axis=1)].sum())
+        tally.n_empty = int(weights[~present.any(axis=1)].sum())
+
+        # Ключ первого появления: (номер бюллетеня, место в нём)
+        seen = np.flatnonzero(present.any(axis=0))
+        first_row = present.argmax(axis=0)
+        keys = first_row[seen] * (m + 1) + positions[first_row[seen], seen]
+        tally._borda_order = [int(i) for i in seen[np.argsort(keys, kind="stable")]]
+        tally._borda_seen = set(tally._borda_order)
+        leaders = np.flatnonzero(first.any(axis=0))
+        leader_rows = first.argmax(axis=0)[leaders]
+        tally._first_order = [int(i) for i in leaders[np.argsort(leader_rows, kind="stable")]]
+        tally._first_seen = set(tally._first_order)
+        return tally
+
+    def _levels(self, ranking: Ballot) -> tuple[np.ndarray, list[int]]:
+        """Уровни альтернатив в бюллетене (-1 — не ранжирована) и порядок их появления."""
+        levels = np.full(len(self.names), -1, dtype=np.int64)
+        order = []
+        for level, group in enumerate(ballot_groups(ranking)):
+            for alt in group:
+                i = self.name_index.get(alt)
+                if i is None:
+                    raise ValueError(f"Неизвестная альтернатива в бюллетене: {alt}")
+                if levels[i] < 0:
+                    levels[i] = level
+                    order.append(i)
+        return levels, order
+
+    def _apply(self, ranking: Ballot, count: int):
+        levels, order = self._levels(ranking)
+        present = levels >= 0
+        weight = np.array([count], dtype=np.int64)
+        self.matrix += pairwise_matrix(levels[None, :], weight)
+        first, points = positional_scores(levels[None, :], weight, len(self.alternatives))
+        self.first_counts += first
+        self.borda_totals += points
+        self.present_counts += count * present
+        self.n_voters += count
+        if not present.all():
+            self.n_incomplete += count
+        if not order:
+            self.n_empty += count
+            return
+
+        if count > 0:
+            for i in order:
+                if levels[i] == 0 and i not in self._first_seen:
+                    self._first_seen.add(i)
+                    self._first_order.append(i)
+                if i not in self._borda_seen:
+                    self._borda_seen.add(i)
+                    self._borda_order.append(i)
+
+    def add_ballot(self, ranking: Ballot, count: int = 1):
+        """Учитывает count одинаковых бюллетеней."""
+        if count < 0:
+            raise ValueError("Число голосов не может быть отрицательным")
+        self._apply(ranking, count)
+        if self._ballots is not None:
+            self._ballots.add(ranking, count)
+
+    def retract_ballot(self, ranking: Ballot, count: int = 1):
+        """Отзывает ранее учтённые бюллетени."""
+        if count < 0:
+            raise ValueError("Число голосов не может быть отрицательным")
+        if count > self.n_voters:
+            raise ValueError("Нельзя отозвать больше бюллетеней, чем было подано")
+        if self._ballots is not None:
+            self._ballots.remove(ranking, count)
+        else:
+            levels, _ = self._levels(ranking)
+            weight = np.array([count], dtype=np.int64)
+            first, points = positional_scores(levels[None, :], weight, len(self.alternatives))
+            if ((self.matrix < pairwise_matrix(levels[None, :], weight)).any()
+                    or (self.first_counts < first).any() or (self.borda_totals < points).any()
+                    or (self.present_counts < count * (levels >= 0)).any()):
+                raise ValueError("Бюллетень не мог быть учтён в подсчёте")
+        self._apply(ranking, -count)
+
+    def merge(self, other: "IncrementalTally") -> "IncrementalTally":
+        """Добавляет к подсчёту результаты другого шарда."""
+        if other.alternatives != self.alternatives:
+            raise ValueError("Объединять можно только подсчёты по одинаковым альтернативам")
+        self.matrix += other.matrix
+        self.first_counts += other.first_counts
+        self.borda_totals += other.borda_totals
+        self.present_counts += other.present_counts
+        self.n_voters += other.n_voters
+        self.n_incomplete += other.n_incomplete
+        self.n_empty += other.n_empty
+        if self._ballots is not None and other._ballots is not None:
+            for ranking, count in other._ballots.items():
+                self._ballots.add(ranking, count)
+        else:
+            self._ballots = None
+        for i in other._first_order:
+            if i not in self._first_seen:
+                self._first_seen.add(i)
+                self._first_order.append(i)
+        for i in other._borda_order:
+            if i not in self._borda_seen:
+                self._borda_seen.add(i)
+                self._borda_order.append(i)
+        return self
+
+    def borda_count(self) -> dict[str, int | float]:
+        """Модель Борда: p-1 очков за 1-е место, ..., 0 за последнее."""
+        order = self._borda_order + [i for i in range(len(self.names)) if i not in self._borda_seen]
+        return {self.names[i]: as_number(self.borda_totals[i]) for i in order}
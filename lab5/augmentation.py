@@ -0,0 +1,71 @@
+import numpy as np
+
+from neural_network import GRID_SIZE
+
+
+def shift(images, dy, dx):
+    """
+    Сдвиг каждого образа на (dy[i], dx[i]) без переноса через край.
+
+    Весь пакет обрабатывается одной выборкой по индексам из дополненного нулями массива.
+    """
+    n, h, w = images.shape
+    pad = int(max(np.abs(dy).max(initial=0), np.abs(dx).max(initial=0)))
+    padded = np.pad(images, ((0, 0), (pad, pad), (pad, pad)))
+    rows = (np.arange(h) + pad - dy[:, None])[:, :, None]
+    cols = (np.arange(w) + pad - dx[:, None])[:, None, :]
+    return padded[np.arange(n)[:, None, None], rows, cols]
+
+
+def neighbour(images, direction):
+    """Образы, сдвинутые на один пиксель в направлении direction[i] (0 — вниз, 1 — вправо, 2 — вверх, 3 — влево)"""
+    dy = np.array([1, 0, -1, 0])[direction]
+    dx = np.array([0, 1, 0, -1])[direction]
+    return shift(images, dy, dx)
+
+
+def augment(X, rng, max_shift=1, morph_prob=0.3, flip_prob=0.02, grid_size=GRID_SIZE):
+    """
+    Случайные варианты пакета двоичных образов (n, grid_size²).
+
+    Каждый образ сдвигается не более чем на max_shift пикселей, с вероятностью
+    morph_prob утолщается или утончается на пиксель в случайном направлении
+    (утончение, стирающее больше половины образа, не применяется), затем
+    каждый пиксель инвертируется с вероятностью flip_prob.
+    Все операции выполняются над пакетом целиком.
+    """
+    n = X.shape[0]
+    images = np.asarray(X).reshape(n, grid_size, grid_size) != 0
+
+    dy = rng.integers(-max_shift, max_shift + 1, n)
+    dx = rng.integers(-max_shift, max_shift + 1, n)
+    images = shift(images, dy, dx)
+
+    moved = neighbour(images, rng.integers(0, 4, n))
+    morph = rng.random(n)
+    dilated = images | moved
+    eroded = images & moved
+    keep_erosion = eroded.sum(axis=(1, 2)) * 2 >= images.sum(axis=(1, 2))
+    images = np.where((morph < morph_prob / 2)[:, None, None], dilated, images)
+    erode = (morph >= morph_prob / 2) & (morph < morph_prob) & keep_erosion
+    images = np.where(erode[:, None, None], eroded, images)
+
+    images ^= rng.random(images.shape) < flip_prob
+    return images.reshape(n, -1).astype(np.float64)
+
+
+def augmented_batches(X, y, batch_size, rng, epochs=1, **params):
+    """
+    Генератор перемешанных мини-пакетов со случайными вариантами образов.
+
+    Варианты создаются для каждого пакета заново; расширенная выборка
+    в памяти не хранится. epochs=None — бесконечный поток.
+    """
+    n = X.shape[0]
+    epoch = 0
+    while epochs is None or epoch < epochs:
+        order = rng.permutation(n)
+        for start in range(0, n, batch_size):
+            batch = order[start:start + batch_size]
+            yield augment(X[batch], rng, **params), y[batch]
+        epoch += 1
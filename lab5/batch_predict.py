@@ -0,0 +1,99 @@
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+
+from neural_network import ROMAN_DIGITS, NeuralNetwork
+from storage import FORMAT_VERSION, WEIGHTS_PATH, read_header, write_header
+
+# Файл образов: заголовок, затем образы по input_size бит, упакованные
+# np.packbits построчно (100 бит → 13 байт)
+GLYPHS_FORMAT = 'lab5-glyphs'
+DEFAULT_BATCH_SIZE = 4096
+
+
+def write_glyph_file(path, X):
+    """Записывает двоичные образы (n, input_size) в упакованном виде; возвращает их число"""
+    X = np.asarray(X) != 0
+    with open(path, 'wb') as f:
+        write_header(f, {'format': GLYPHS_FORMAT, 'version': FORMAT_VERSION, 'input_size': X.shape[1]})
+        f.write(np.packbits(X, axis=1).tobytes())
+    return X.shape[0]
+
+
+def open_glyph_file(path):
+    """Упакованные образы файла (отображение в память) и размер образа в битах"""
+    header, offset = read_header(path, GLYPHS_FORMAT)
+    input_size = header['input_size']
+    row_bytes = -(-input_size // 8)
+    n = (os.path.getsize(path) - offset) // row_bytes
+    if n == 0:
+        return np.zeros((0, row_bytes), dtype=np.uint8), input_size
+    return np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(n, row_bytes)), input_size
+
+
+def iter_batches(packed, input_size, batch_size=DEFAULT_BATCH_SIZE, dtype=np.float64):
+    """Распаковывает образы пакетами: с диска читаются только байты текущего пакета"""
+    for start in range(0, packed.shape[0], batch_size):
+        bits = np.unpackbits(packed[start:start + batch_size], axis=1, count=input_size)
+        yield start, bits.astype(dtype)
+
+
+def top_k(nn, X, k=3):
+    """
+    k наиболее вероятных классов для каждого образа.
+
+    Возвращает номера классов (n, k) и вероятности (n, k) по убыванию.
+    Выходы сигмоиды нормируются на сумму, чтобы получить распределение.
+    """
+    output = nn.forward(X)
+    if nn.output_activation != 'softmax':
+        output = output / output.sum(axis=1, keepdims=True)
+    k = min(k, output.shape[1])
+    # argpartition выбирает k лучших за O(m), сортируются только они
+    best = np.argpartition(-output, k - 1, axis=1)[:, :k]
+    probs = np.take_along_axis(output, best, axis=1)
+    order = np.argsort(-probs, axis=1)
+    return np.take_along_axis(best, order, axis=1), np.take_along_axis(probs, order, axis=1)
+
+
+def predict_file(nn, path, k=3, batch_size=DEFAULT_BATCH_SIZE):
+    """Классифицирует файл образов пакетами; выдаёт (начальный номер, классы, вероятности)"""
+    packed, input_size = open_glyph_file(path)
+    if input_size != nn.input_size:
+        raise ValueError(f"Образы в файле из {input_size} пикселей, сеть ожидает {nn.input_size}")
+    for start, X in iter_batches(packed, input_size, batch_size):
+        labels, probs = top_k(nn, X, k)
+        yield start, labels, probs
+
+
+def label_name(label):
+    return ROMAN_DIGITS[label] if label < len(ROMAN_DIGITS) else str(label)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетное распознавание образов из файла")
+    parser.add_argument("path", help="файл упакованных образов")
+    parser.add_argument("--weights", default=WEIGHTS_PATH, help="файл весов")
+    parser.add_argument("--top", type=int, default=3, help="число лучших классов")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--output", help="CSV-файл результатов (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    nn = NeuralNetwork.from_file(args.weights)
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(['index'] + [f'{name}{i + 1}' for i in range(args.top) for name in ('label', 'p')])
+        for start, labels, probs in predict_file(nn, args.path, args.top, args.batch_size):
+            for row, (lab, prob) in enumerate(zip(labels, probs), start):
+                writer.writerow([row] + [v for l, p in zip(lab, prob) for v in (label_name(l), f'{p:.4f}')])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Пропускная способность пакетного распознавания в зависимости от размера пакета
+
+Запуск: python benchmark_inference.py [число_образов]
+
+Образы — зашумлённые копии обучающей выборки (open_dataset), записанные
+в упакованный файл (13 байт на образ). Измеряется полный путь: чтение с диска, np.unpackbits,
+прямой проход и выбор k лучших классов. Для сравнения — поштучный вызов
+predict, как в графическом интерфейсе.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from batch_predict import predict_file, write_glyph_file
+from neural_network import load_network
+from storage import open_dataset
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    base, _ = open_dataset().arrays()
+    if not len(base):
+        sys.exit("Обучающая выборка пуста.")
+    rng = np.random.default_rng(0)
+    X = np.abs(base[rng.integers(0, len(base), n)].astype(np.float64) - (rng.random((n, base.shape[1])) < 0.05))
+
+    nn = load_network()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'glyphs.bin')
+        write_glyph_file(path, X)
+        print(f"Образов: {n}, файл: {os.path.getsize(path) / 1024:.0f} КБ")
+
+        single = min(n, 2000)
+        start = time.perf_counter()
+        for i in range(single):
+            nn.predict(X[i:i + 1])
+        rate = single / (time.perf_counter() - start)
+        print(f"{'поштучно predict':>20}: {rate:>12,.0f} образов/с")
+
+        for batch_size in (16, 256, 4096, 65536):
+            start = time.perf_counter()
+            for _ in predict_file(nn, path, k=3, batch_size=batch_size):
+                pass
+            rate = n / (time.perf_counter() - start)
+            print(f"{'пакет ' + str(batch_size):>20}: {rate:>12,.0f} образов/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Время эпохи и выделения памяти: исходный цикл NeuralNetwork.train против BufferedTrainer
+
+Запуск: python benchmark_training.py [число_примеров]
+
+Выборка — зашумлённые копии обучающей выборки (open_dataset). Сравнение
+проводится при одинаковой работе за эпоху: полный пакет (как в исходном цикле) и мини-пакеты по 32.
+Пиковая память за эпоху (сверх выборки и весов) измеряется через tracemalloc.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from neural_network import NeuralNetwork
+from storage import open_dataset
+from training import BufferedTrainer
+
+
+def make_dataset(n):
+    samples, labels = open_dataset().arrays()
+    if not len(labels):
+        sys.exit("Обучающая выборка пуста.")
+    rng = np.random.default_rng(0)
+    idx = rng.integers(0, len(labels), n)
+    X = np.abs(samples[idx].astype(np.float64) - (rng.random((n, samples.shape[1])) < 0.05))
+    Y = np.eye(7)[labels[idx]]
+    return X, Y
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    X, Y = make_dataset(n)
+    epochs = 20
+    print(f"Примеров: {n}, эпох: {epochs}")
+    print(f"{'вариант':<34}{'эпоха, мс':>12}{'пиковая память, КБ':>20}")
+
+    def report(name, run):
+        run(1)  # прогрев кэшей BLAS
+        tracemalloc.start()
+        run(1)
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        start = time.perf_counter()
+        run(epochs)
+        elapsed = (time.perf_counter() - start) / epochs * 1000
+        print(f"{name:<34}{elapsed:>12.2f}{peak:>20.1f}")
+
+    np.random.seed(0)
+    nn = NeuralNetwork()
+    report("исходный цикл, полный пакет", lambda e: nn.train(X, Y, epochs=e, lr=0.3 / n))
+    for batch_size in (n, 32):
+        for dtype in (np.float64, np.float32):
+            trainer = BufferedTrainer(NeuralNetwork(), batch_size=batch_size, dtype=dtype, lr=0.3,
+                                      momentum=0 if batch_size == n else 0.9)
+            # Выборка приводится к типу заранее, чтобы fit не копировал её
+            Xd, Yd = X.astype(dtype), Y.astype(dtype)
+            label = "полный пакет" if batch_size == n else f"пакеты по {batch_size}"
+            report(f"буферы {np.dtype(dtype).name}, {label}", lambda e, t=trainer, Xd=Xd, Yd=Yd: t.fit(Xd, Yd, epochs=e, seed=0))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,32 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 import numpy as np
-import pickle
-import os
-from neural_network import NeuralNetwork
+from neural_network import GRID_SIZE, ROMAN_DIGITS, load_network
+from online import OnlineLearner
+from storage import open_dataset
+from training import Adam, train
 
-# Отображение римских цифр
-ROMAN_DIGITS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII']
-GRID_SIZE = 10
 PIXEL_SIZE = 30
 
 class RomanRecognizerApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Распознавание римских цифр")
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
         self.drawing = False
+        # Точки движения мыши, ещё не нанесённые на холст, и последняя закрашенная клетка
+        self.pending = []
+        self.flush_id = None
+        self.last_cell = None
 
         # Инициализация нейросети
-        self.nn = NeuralNetwork()
-        self.nn.load_weights()
+        self.nn = self.load_network()
         self.nn.print_architecture()
 
         # Загрузка обучающей выборки
-        self.dataset = self.load_dataset()
+        self.dataset = open_dataset()
+        # Дообучение на каждом добавленном примере создаётся при первом использовании
+        self.learner = None
 
         # Создание интерфейса
         self.create_widgets()
@@ -45,6 +48,8 @@ class RomanRecognizerApp:
         tk.Button(control_frame, text="Добавить в обучение", command=self.add_to_dataset).pack(pady=5)
         tk.Button(control_frame, text="Обучить сеть", command=self.train_network).pack(pady=5)
         tk.Button(control_frame, text="Управление выборкой", command=self.manage_dataset).pack(pady=5)
+        self.online_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(control_frame, text="Дообучать при добавлении", variable=self.online_var).pack(pady=5)
 
         self.result_label = tk.Label(control_frame, text="Результат: —", font=("Arial", 12))
         self.result_label.pack(pady=10)
@@ -52,38 +57,63 @@ class RomanRecognizerApp:
         self.draw_grid()
 
     def draw_grid(self):
+        """Создаёт клетки холста один раз; дальше меняется только их цвет"""
+        self.cells = np.empty((GRID_SIZE, GRID_SIZE), dtype=np.int64)
         for i in range(GRID_SIZE):
             for j in range(GRID_SIZE):
                 x1, y1 = j * PIXEL_SIZE, i * PIXEL_SIZE
                 x2, y2 = x1 + PIXEL_SIZE, y1 + PIXEL_SIZE
-                color = "black" if self.grid[i][j] else "white"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="lightgray")
+                color = "black" if self.grid[i, j] else "white"
+                self.cells[i, j] = self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="lightgray")
 
     def start_draw(self, event):
         self.drawing = True
-        self.update_pixel(event)
+        self.last_cell = None
+        self.pending.append((event.x, event.y))
+        self.flush_strokes()
 
     def draw(self, event):
-        if self.drawing:
-            self.update_pixel(event)
+        if not self.drawing:
+            return
+        # События движения копятся и наносятся одним вызовом, когда цикл событий освободится
+        self.pending.append((event.x, event.y))
+        if self.flush_id is None:
+            self.flush_id = self.root.after_idle(self.flush_strokes)
 
     def stop_draw(self, _):
+        self.flush_strokes()
         self.drawing = False
-
-    def update_pixel(self, event):
-        col = event.x // PIXEL_SIZE
-        row = event.y // PIXEL_SIZE
-        if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
-            self.grid[row][col] = 1
-            self.draw_grid()
+        self.last_cell = None
+
+    def flush_strokes(self):
+        if self.flush_id is not None:
+            self.root.after_cancel(self.flush_id)
+            self.flush_id = None
+        for x, y in self.pending:
+            cell = (y // PIXEL_SIZE, x // PIXEL_SIZE)
+            # Промежуточные клетки закрашиваются, чтобы быстрый штрих не рвался
+            start = self.last_cell or cell
+            steps = max(abs(cell[0] - start[0]), abs(cell[1] - start[1]))
+            for t in range(1, steps + 1):
+                self.update_pixel(start[0] + round((cell[0] - start[0]) * t / steps),
+                                  start[1] + round((cell[1] - start[1]) * t / steps))
+            self.update_pixel(*cell)
+            self.last_cell = cell
+        self.pending.clear()
+
+    def update_pixel(self, row, col):
+        if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE and not self.grid[row, col]:
+            self.grid[row, col] = 1
+            self.canvas.itemconfig(int(self.cells[row, col]), fill="black")
 
     def clear_canvas(self):
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.draw_grid()
+        for item in self.cells[self.grid != 0]:
+            self.canvas.itemconfig(int(item), fill="white")
+        self.grid[:] = 0
         self.result_label.config(text="Результат: —")
 
     def get_flattened_input(self):
-        return np.array(self.grid, dtype=float).flatten().reshape(1, -1)
+        return self.grid.reshape(1, -1).astype(float)
 
     def recognize(self):
         X = self.get_flattened_input()
@@ -103,22 +133,41 @@ class RomanRecognizerApp:
             messagebox.showerror("Ошибка", "Неверная метка. Допустимы: I, II, III, IV, V, VI, VII.")
             return
         y = ROMAN_DIGITS.index(label)
-        self.dataset.append((X.flatten(), y))
-        self.save_dataset()
-        messagebox.showinfo("Успех", f"Образ добавлен как '{label}'")
+        self.dataset.append(X.flatten(), y)
+        if not self.online_var.get():
+            self.learner = None
+            messagebox.showinfo("Успех", f"Образ добавлен как '{label}'")
+            return
+
+        if self.learner is None:
+            old_X, old_y = self.dataset.arrays()
+            old_X, old_y = old_X[:-1].astype(float), old_y[:-1]
+            self.learner = OnlineLearner(self.nn, old_X, np.eye(self.nn.output_size)[old_y])
+        info = self.learner.update(X, np.eye(self.nn.output_size)[[y]])
+        self.nn.save_weights()
+        if info['rolled_back']:
+            messagebox.showinfo("Успех", f"Образ добавлен как '{label}'. Дообучение отменено: "
+                                         "оно ухудшало распознавание прежних примеров.")
+        else:
+            messagebox.showinfo("Успех", f"Образ добавлен как '{label}', сеть дообучена "
+                                         f"за {info['time'] * 1000:.0f} мс")
 
     def manage_dataset(self):
-        if not self.dataset:
+        if not len(self.dataset):
             messagebox.showinfo("Выборка", "Обучающая выборка пуста.")
             return
-        info = "\n".join([f"{i+1}. {ROMAN_DIGITS[y]}" for i, (_, y) in enumerate(self.dataset)])
+        _, labels = self.dataset.arrays()
+        info = "\n".join([f"{i+1}. {ROMAN_DIGITS[y]}" for i, y in enumerate(labels)])
+        # Отображение файла освобождается: delete() заменяет файл
+        del labels
         choice = simpledialog.askstring("Выборка", f"Текущие примеры:\n{info}\n\n"
                                                     "Введите номер для удаления или '0' для отмены:")
         if choice and choice.isdigit():
             idx = int(choice) - 1
             if 0 <= idx < len(self.dataset):
-                del self.dataset[idx]
-                self.save_dataset()
+                self.dataset.delete(idx)
+                # Буфер повторения мог содержать удалённый пример
+                self.learner = None
                 messagebox.showinfo("Успех", "Пример удалён.")
             elif idx == -1:
                 pass
@@ -129,25 +178,22 @@ class RomanRecognizerApp:
         if len(self.dataset) < 2:
             messagebox.showwarning("Ошибка", "Недостаточно данных для обучения (минимум 2 примера).")
             return
-        X = np.array([item[0] for item in self.dataset])
-        y = np.array([item[1] for item in self.dataset])
+        X, y = self.dataset.arrays()
+        X = X.astype(float)
         # Преобразуем метки в one-hot encoding
         Y = np.zeros((y.size, 7))
         Y[np.arange(y.size), y] = 1
 
-        self.nn.train(X, Y, epochs=2000, lr=0.3)
+        # Пакеты дополняются сдвинутыми и зашумлёнными вариантами образов;
+        # контрольная выборка отделяется, только когда примеров достаточно
+        history = train(self.nn, X, Y, epochs=2000, batch_size=16, optimizer=Adam(lr=0.01), augment=True,
+                        validation_split=0.2 if len(self.dataset) >= 50 else 0.0)
         self.nn.save_weights()
-        messagebox.showinfo("Готово", "Сеть обучена и веса сохранены!")
-
-    def load_dataset(self, path='dataset.pkl'):
-        if os.path.exists(path):
-            with open(path, 'rb') as f:
-                return pickle.load(f)
-        return []
+        messagebox.showinfo("Готово", f"Сеть обучена за {history['epochs']} эпох и веса сохранены!")
 
-    def save_dataset(self, path='dataset.pkl'):
-        with open(path, 'wb') as f:
-            pickle.dump(self.dataset, f)
+    def load_network(self):
+        # Архитектура берётся из файла весов; старый weights.pkl переносится при первом запуске
+        return load_network()
 
 if __name__ == "__main__":
     root = tk.Tk()
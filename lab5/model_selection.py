@@ -0,0 +1,166 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from neural_network import ROMAN_DIGITS, NeuralNetwork
+from storage import WEIGHTS_PATH, open_dataset
+from training import BufferedTrainer
+
+# Переменные окружения, ограничивающие число потоков BLAS в процессе
+BLAS_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                         'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+
+def stratified_folds(y, k, seed=0):
+    """Номер блока для каждого примера; классы распределяются по блокам равномерно"""
+    rng = np.random.default_rng(seed)
+    folds = np.empty(len(y), dtype=np.int64)
+    for label in np.unique(y):
+        members = rng.permutation(np.flatnonzero(y == label))
+        folds[members] = (np.arange(members.size) + rng.integers(k)) % k
+    return folds
+
+
+def grid(hidden_sizes, learning_rates, epochs):
+    """Все сочетания гиперпараметров"""
+    return [{'hidden_sizes': list(h), 'lr': lr, 'epochs': e}
+            for h, lr, e in itertools.product(hidden_sizes, learning_rates, epochs)]
+
+
+def random_search(n, seed=0, max_layers=2):
+    """n случайных конфигураций: размеры слоёв и шаг — по логарифмической шкале"""
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(n):
+        layers = int(rng.integers(1, max_layers + 1))
+        sizes = sorted((int(2 ** rng.uniform(3, 7)) for _ in range(layers)), reverse=True)
+        configs.append({'hidden_sizes': sizes, 'lr': float(10 ** rng.uniform(-2, 0)),
+                        'epochs': int(rng.choice([50, 100, 200, 400]))})
+    return configs
+
+
+def build_network(config, input_size, output_size):
+    return NeuralNetwork(input_size=input_size, output_size=output_size, output_activation='softmax',
+                         hidden_sizes=config['hidden_sizes'])
+
+
+def fit(config, X, y, output_size, seed=0):
+    """Обучает сеть конфигурации на (X, y); возвращает сеть и время обучения, с"""
+    np.random.seed(seed)
+    nn = build_network(config, X.shape[1], output_size)
+    Y = np.eye(output_size)[y]
+    start = time.perf_counter()
+    BufferedTrainer(nn, batch_size=min(32, len(y)), lr=config['lr']).fit(X, Y, config['epochs'], seed=seed)
+    return nn, time.perf_counter() - start
+
+
+def cross_validate(config, X, y, folds, output_size, seed=0):
+    """Точность на каждом блоке, среднее время обучения и время распознавания одного образа"""
+    accuracies, train_times, infer_times = [], [], []
+    for fold in range(folds.max() + 1):
+        test = folds == fold
+        if not test.any() or test.all():
+            continue
+        nn, train_time = fit(config, X[~test], y[~test], output_size, seed + fold)
+        start = time.perf_counter()
+        predicted = nn.predict(X[test])
+        infer_times.append((time.perf_counter() - start) / test.sum())
+        accuracies.append(float(np.mean(predicted == y[test])))
+        train_times.append(train_time)
+    return {
+        'config': config,
+        'accuracy': float(np.mean(accuracies)),
+        'accuracy_std': float(np.std(accuracies)),
+        'train_time': float(np.mean(train_times)),
+        'infer_time': float(np.mean(infer_times)),
+    }
+
+
+def _pin_blas_threads(threads):
+    """Инициализатор работника: ограничение потоков BLAS, если доступен threadpoolctl"""
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return  # ограничение задано переменными окружения при запуске процесса
+    threadpool_limits(threads)
+
+
+def _evaluate_task(task):
+    return cross_validate(*task)
+
+
+def search(configs, X, y, k=5, workers=None, threads_per_worker=1, seed=0, output_size=None):
+    """
+    k-кратная перекрёстная проверка всех конфигураций в пуле процессов.
+
+    Работники запускаются заново (spawn) с переменными окружения BLAS,
+    ограничивающими их threads_per_worker потоками, чтобы работники
+    не конкурировали за ядра. Результаты упорядочены по убыванию точности.
+    """
+    output_size = output_size or int(y.max()) + 1
+    folds = stratified_folds(y, k, seed)
+    tasks = [(config, X, y, folds, output_size, seed) for config in configs]
+    if workers == 1:
+        results = [_evaluate_task(task) for task in tasks]
+    else:
+        saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+        os.environ.update({name: str(threads_per_worker) for name in BLAS_THREAD_VARIABLES})
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_pin_blas_threads, initargs=(threads_per_worker,)) as pool:
+                results = list(pool.map(_evaluate_task, tasks))
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    return sorted(results, key=lambda r: (-r['accuracy'], r['train_time']))
+
+
+def _sizes(text):
+    return [int(size) for size in text.split(',') if size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Подбор гиперпараметров перекрёстной проверкой")
+    parser.add_argument("--hidden", type=_sizes, nargs="+", default=[[15], [30], [60], [64, 32]],
+                        help="размеры скрытых слоёв через запятую, например 30 64,32")
+    parser.add_argument("--lr", type=float, nargs="+", default=[0.1, 0.3])
+    parser.add_argument("--epochs", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--random", type=int, default=0, help="случайный поиск из N конфигураций вместо сетки")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=WEIGHTS_PATH, help="файл весов лучшей конфигурации")
+    args = parser.parse_args()
+
+    X, y = open_dataset().arrays()
+    X, y = X.astype(np.float64), y.astype(np.int64)
+    configs = random_search(args.random, args.seed) if args.random else grid(args.hidden, args.lr, args.epochs)
+    results = search(configs, X, y, args.folds, args.workers, args.threads_per_worker, args.seed,
+                     output_size=len(ROMAN_DIGITS))
+
+    print(f"Примеров: {len(y)}, блоков: {args.folds}, конфигураций: {len(configs)}")
+    print(f"{'скрытые слои':<14}{'шаг':>7}{'эпох':>6}{'точность':>14}{'обучение, мс':>14}{'распозн., мкс':>15}")
+    for r in results:
+        c = r['config']
+        layers = ','.join(map(str, c['hidden_sizes']))
+        print(f"{layers:<14}{c['lr']:>7.3f}{c['epochs']:>6}"
+              f"{r['accuracy']:>8.3f} ±{r['accuracy_std']:.2f}"
+              f"{r['train_time'] * 1000:>14.1f}{r['infer_time'] * 1e6:>15.2f}")
+
+    best = results[0]['config']
+    nn, _ = fit(best, X, y, len(ROMAN_DIGITS), args.seed)
+    nn.save_weights(args.output)
+    print(f"Лучшая конфигурация {best} обучена на всей выборке и сохранена в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
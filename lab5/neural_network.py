@@ -1,98 +1,238 @@
 import numpy as np
 import pickle
 import os
+from storage import BASE_DIR, WEIGHTS_FORMAT, WEIGHTS_PATH, load_arrays, read_header, save_arrays
+
+# Отображение римских цифр
+ROMAN_DIGITS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII']
+GRID_SIZE = 10
+
+
+def sigmoid(x):
+    # Ограничение аргумента для избежания переполнения
+    x = np.clip(x, -500, 500)
+    return 1 / (1 + np.exp(-x))
+
+
+def softmax(x):
+    # Вычитание максимума не меняет результат и исключает переполнение
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def relu(x):
+    return np.maximum(x, 0)
+
+
+# Функции активации и их производные, выраженные через выход слоя a
+ACTIVATIONS = {
+    'sigmoid': (sigmoid, lambda a: a * (1 - a)),
+    'tanh': (np.tanh, lambda a: 1 - a * a),
+    'relu': (relu, lambda a: (a > 0).astype(a.dtype)),
+    'softmax': (softmax, None),  # только выходной слой, с перекрёстной энтропией
+}
+
+ACTIVATION_NAMES = {
+    'sigmoid': 'сигмоида',
+    'tanh': 'гиперболический тангенс',
+    'relu': 'ReLU',
+    'softmax': 'softmax',
+}
+
+
+class Dense:
+    """Полносвязный слой: a = f(X·W + b)"""
+
+    def __init__(self, input_size, output_size, activation='sigmoid'):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Неизвестная функция активации: {activation}")
+        self.input_size = input_size
+        self.output_size = output_size
+        self.activation = activation
+        # Масштаб начальных весов: как в исходной сети для сигмоиды, He/Xavier для ReLU/tanh
+        if activation == 'relu':
+            scale = np.sqrt(2 / input_size)
+        elif activation == 'tanh':
+            scale = np.sqrt(1 / input_size)
+        else:
+            scale = 0.1
+        self.W = np.random.randn(input_size, output_size) * scale
+        self.b = np.zeros((1, output_size))
+
+    def forward(self, X):
+        return ACTIVATIONS[self.activation][0](np.dot(X, self.W) + self.b)
+
+    def derivative(self, a):
+        return ACTIVATIONS[self.activation][1](a)
+
 
 class NeuralNetwork:
     """
-    Многослойный персептрон с одним скрытым слоем.
-    Используется сигмоидная функция активации.
+    Многослойный персептрон: стек полносвязных слоёв.
+
+    По умолчанию — исходная сеть 100-30-7 с сигмоидной функцией активации.
     """
 
-    def __init__(self, input_size=100, hidden_size=30, output_size=7):
+    def __init__(self, input_size=100, hidden_size=30, output_size=7, output_activation='sigmoid',
+                 hidden_sizes=None, hidden_activation='sigmoid'):
         """
         input_size: количество входов (10x10 изображение = 100 пикселей)
         hidden_size: количество нейронов в скрытом слое
         output_size: количество выходов (римские цифры I, II, III, IV, V, VI, VII → 7 классов)
+        output_activation: 'sigmoid' (квадратичная ошибка) или 'softmax' (перекрёстная энтропия)
+        hidden_sizes: размеры скрытых слоёв, не пустой список (заменяет hidden_size)
+        hidden_activation: активация скрытых слоёв — имя или список имён по слоям
         """
+        hidden_sizes = list(hidden_sizes) if hidden_sizes is not None else [hidden_size]
+        if not hidden_sizes:
+            raise ValueError("Сеть должна содержать хотя бы один скрытый слой")
+        if isinstance(hidden_activation, str):
+            hidden_activation = [hidden_activation] * len(hidden_sizes)
+        if len(hidden_activation) != len(hidden_sizes):
+            raise ValueError("Число функций активации не совпадает с числом скрытых слоёв")
+        if 'softmax' in hidden_activation:
+            raise ValueError("softmax допустима только в выходном слое")
+
         self.input_size = input_size
-        self.hidden_size = hidden_size
+        self.hidden_size = hidden_sizes[0]
         self.output_size = output_size
 
         # Инициализация весов случайными значениями
-        self.W1 = np.random.randn(self.input_size, self.hidden_size) * 0.1
-        self.b1 = np.zeros((1, self.hidden_size))
-        self.W2 = np.random.randn(self.hidden_size, self.output_size) * 0.1
-        self.b2 = np.zeros((1, self.output_size))
+        sizes = [input_size, *hidden_sizes, output_size]
+        activations = [*hidden_activation, output_activation]
+        self.layers = [Dense(sizes[k], sizes[k + 1], activations[k]) for k in range(len(activations))]
+
+    # Веса первых двух слоёв под исходными именами
+    W1 = property(lambda self: self.layers[0].W, lambda self, value: setattr(self.layers[0], 'W', value))
+    b1 = property(lambda self: self.layers[0].b, lambda self, value: setattr(self.layers[0], 'b', value))
+    W2 = property(lambda self: self.layers[1].W, lambda self, value: setattr(self.layers[1], 'W', value))
+    b2 = property(lambda self: self.layers[1].b, lambda self, value: setattr(self.layers[1], 'b', value))
+
+    @property
+    def output_activation(self):
+        return self.layers[-1].activation
+
+    @property
+    def layer_sizes(self):
+        return [self.input_size] + [layer.output_size for layer in self.layers]
 
     def sigmoid(self, x):
-        # Ограничение аргумента для избежания переполнения
-        x = np.clip(x, -500, 500)
-        return 1 / (1 + np.exp(-x))
+        return sigmoid(x)
 
     def sigmoid_derivative(self, x):
         return x * (1 - x)
 
     def forward(self, X):
-        """Прямое распространение"""
-        self.z1 = np.dot(X, self.W1) + self.b1
-        self.a1 = self.sigmoid(self.z1)
-        self.z2 = np.dot(self.a1, self.W2) + self.b2
-        self.a2 = self.sigmoid(self.z2)
-        return self.a2
+        """Прямое распространение; выходы всех слоёв сохраняются для обратного прохода"""
+        self.outputs = [X]
+        for layer in self.layers:
+            self.outputs.append(layer.forward(self.outputs[-1]))
+        return self.outputs[-1]
 
-    def train(self, X, y, epochs=1000, lr=0.1):
-        """Обучение методом обратного распространения ошибки"""
-        m = X.shape[0]
-        for epoch in range(epochs):
-            # Прямой проход
-            output = self.forward(X)
+    def parameters(self):
+        """Обучаемые параметры (изменяются оптимизатором на месте)"""
+        return [p for layer in self.layers for p in (layer.W, layer.b)]
 
-            # Ошибка на выходе
-            error_output = y - output
-            d_output = error_output * self.sigmoid_derivative(output)
+    def gradients(self, X, y):
+        """
+        Градиенты средней ошибки по параметрам (в порядке parameters()).
 
-            # Ошибка на скрытом слое
-            error_hidden = d_output.dot(self.W2.T)
-            d_hidden = error_hidden * self.sigmoid_derivative(self.a1)
+        Для softmax — перекрёстная энтропия, иначе квадратичная ошибка.
+        """
+        m = X.shape[0]
+        output = self.forward(X)
+        if self.output_activation == 'softmax':
+            delta = (output - y) / m
+        else:
+            delta = (output - y) * self.layers[-1].derivative(output) / m
+        grads = []
+        for k in range(len(self.layers) - 1, -1, -1):
+            grads.append(np.sum(delta, axis=0, keepdims=True))
+            grads.append(self.outputs[k].T.dot(delta))
+            if k > 0:
+                delta = delta.dot(self.layers[k].W.T) * self.layers[k - 1].derivative(self.outputs[k])
+        return grads[::-1]
 
-            # Обновление весов
-            self.W2 += self.a1.T.dot(d_output) * lr
-            self.b2 += np.sum(d_output, axis=0, keepdims=True) * lr
-            self.W1 += X.T.dot(d_hidden) * lr
-            self.b1 += np.sum(d_hidden, axis=0, keepdims=True) * lr
+    def train(self, X, y, epochs=1000, lr=0.1):
+        """Обучение методом обратного распространения ошибки (полный пакет)"""
+        m = X.shape[0]
+        for epoch in range(epochs):
+            # Градиент суммарной ошибки по всем примерам
+            for p, g in zip(self.parameters(), self.gradients(X, y)):
+                p -= g * (lr * m)
 
     def predict(self, X):
         """Предсказание метки класса"""
         output = self.forward(X)
         return np.argmax(output, axis=1)
 
-    def save_weights(self, filepath='weights.pkl'):
-        """Сохранение весов в файл"""
-        with open(filepath, 'wb') as f:
-            pickle.dump({
-                'W1': self.W1,
-                'b1': self.b1,
-                'W2': self.W2,
-                'b2': self.b2
-            }, f)
-
-    def load_weights(self, filepath='weights.pkl'):
-        """Загрузка весов из файла"""
-        if os.path.exists(filepath):
+    @classmethod
+    def from_file(cls, filepath=WEIGHTS_PATH):
+        """Сеть с архитектурой и весами из файла весов"""
+        header, _ = read_header(filepath, WEIGHTS_FORMAT)
+        sizes, activations = header['layer_sizes'], header['activations']
+        nn = cls(input_size=sizes[0], output_size=sizes[-1], output_activation=activations[-1],
+                 hidden_sizes=sizes[1:-1], hidden_activation=activations[:-1])
+        nn.load_weights(filepath)
+        return nn
+
+    def save_weights(self, filepath=WEIGHTS_PATH):
+        """Сохранение весов в файл (заголовок с архитектурой и сырые массивы)"""
+        arrays = [p for layer in self.layers for p in (layer.W, layer.b)]
+        save_arrays(filepath, WEIGHTS_FORMAT, arrays, layer_sizes=self.layer_sizes,
+                    activations=[layer.activation for layer in self.layers])
+
+    def load_weights(self, filepath=WEIGHTS_PATH):
+        """
+        Загрузка весов из файла.
+
+        Архитектура в заголовке должна совпадать с архитектурой сети.
+        Веса копируются из отображения файла, чтобы файл можно было
+        заменить при следующем сохранении. Файлы .pkl читаются в старом формате.
+        """
+        if not os.path.exists(filepath):
+            print("Файл весов не найден. Инициализация случайными весами.")
+            return
+        if filepath.endswith('.pkl'):
             with open(filepath, 'rb') as f:
                 params = pickle.load(f)
-                self.W1 = params['W1']
-                self.b1 = params['b1']
-                self.W2 = params['W2']
-                self.b2 = params['b2']
+            arrays = [params[f'{name}{k}'] for k in range(1, len(self.layers) + 1) for name in 'Wb']
         else:
-            print("Файл весов не найден. Инициализация случайными весами.")
+            header, arrays = load_arrays(filepath, WEIGHTS_FORMAT)
+            if header['layer_sizes'] != self.layer_sizes:
+                raise ValueError(f"Архитектура в файле {header['layer_sizes']} не совпадает с {self.layer_sizes}")
+        for k, layer in enumerate(self.layers):
+            W, b = arrays[2 * k], arrays[2 * k + 1]
+            if W.shape != layer.W.shape or b.shape != layer.b.shape:
+                raise ValueError(f"Размеры весов слоя {k + 1} не совпадают с архитектурой")
+            layer.W, layer.b = np.array(W), np.array(b)
 
     def print_architecture(self):
         """Вывод архитектуры сети в консоль"""
         print("Архитектура нейронной сети:")
         print(f"  Входной слой: {self.input_size} нейронов")
-        print(f"  Скрытый слой: {self.hidden_size} нейронов")
-        print(f"  Выходной слой: {self.output_size} нейронов")
-        print("  Функция активации: сигмоида")
-        print("  Алгоритм обучения: обратное распространение ошибки")
\ No newline at end of file
+        for layer in self.layers[:-1]:
+            print(f"  Скрытый слой: {layer.output_size} нейронов, "
+                  f"активация: {ACTIVATION_NAMES[layer.activation]}")
+        print(f"  Выходной слой: {self.output_size} нейронов, "
+              f"активация: {ACTIVATION_NAMES[self.output_activation]}")
+        print("  Алгоритм обучения: обратное распространение ошибки")
+
+
+def load_network(filepath=WEIGHTS_PATH):
+    """
+    Сеть из файла весов (архитектура — из заголовка, например выбранная model_selection.py).
+
+    Если файла нет, веса в старом формате (weights.pkl) переносятся в новый;
+    если нет и их, сеть создаётся со случайными весами и об этом выводится сообщение.
+    """
+    if os.path.exists(filepath):
+        return NeuralNetwork.from_file(filepath)
+    nn = NeuralNetwork(output_activation='softmax')
+    legacy = os.path.join(BASE_DIR, 'weights.pkl')
+    if os.path.exists(legacy):
+        nn.load_weights(legacy)
+        nn.save_weights(filepath)
+    else:
+        print("Файл весов не найден. Инициализация случайными весами.")
+    return nn
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+
+from training import SGD
+
+
+class ReplayBuffer:
+    """
+    Ограниченная выборка старых примеров для повторения (резервуарная выборка).
+
+    Пока буфер не заполнен, сохраняются все примеры; затем каждый новый
+    пример заменяет случайный с вероятностью capacity / (число увиденных),
+    так что буфер остаётся равномерной выборкой из всей истории.
+    """
+
+    def __init__(self, capacity, input_size, output_size, seed=None):
+        self.capacity = capacity
+        self.X = np.zeros((capacity, input_size))
+        self.Y = np.zeros((capacity, output_size))
+        self.size = 0
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, X, Y):
+        for x, y in zip(np.atleast_2d(X), np.atleast_2d(Y)):
+            self.seen += 1
+            if self.size < self.capacity:
+                index = self.size
+                self.size += 1
+            else:
+                index = self.rng.integers(self.seen)
+                if index >= self.capacity:
+                    continue
+            self.X[index] = x
+            self.Y[index] = y
+
+    def sample(self, k):
+        """k примеров; классы выбираются равновероятно, чтобы редкие не вытеснялись частыми"""
+        labels = np.argmax(self.Y[:self.size], axis=1)
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        present = np.flatnonzero(counts)
+        classes = present[self.rng.integers(present.size, size=k)]
+        index = order[starts[classes] + (self.rng.random(k) * counts[classes]).astype(np.int64)]
+        return self.X[index], self.Y[index]
+
+
+class OnlineLearner:
+    """
+    Дообучение сети на каждом новом примере за несколько шагов SGD.
+
+    Пакет шага — новые примеры (повторённые new_weight раз) и replay_size
+    примеров из буфера повторения. Защита от катастрофического забывания:
+    кроме повторения, после обновления проверяется точность на контрольной
+    выборке из буфера; если она упала больше чем на tolerance, веса
+    возвращаются к прежним (пример всё равно попадает в буфер).
+    """
+
+    def __init__(self, nn, X=None, Y=None, capacity=2000, replay_size=32, steps=10, lr=0.1,
+                 new_weight=4, probe_size=200, tolerance=0.05, seed=None):
+        self.nn = nn
+        self.buffer = ReplayBuffer(capacity, nn.input_size, nn.output_size, seed)
+        if X is not None and len(X):
+            self.buffer.add(X, Y)
+        self.replay_size = replay_size
+        self.steps = steps
+        self.new_weight = new_weight
+        self.probe_size = probe_size
+        self.tolerance = tolerance
+        self.optimizer = SGD(lr=lr, momentum=0.9)
+
+    def _probe_accuracy(self, X, Y):
+        return float(np.mean(self.nn.predict(X) == np.argmax(Y, axis=1))) if len(X) else 1.0
+
+    def update(self, X_new, Y_new):
+        """
+        Дообучает сеть на новых примерах; возвращает сведения об обновлении:
+        время (с), точность на контроле до и после и признак отката.
+        """
+        start = time.perf_counter()
+        X_new, Y_new = np.atleast_2d(X_new), np.atleast_2d(Y_new)
+        probe_X, probe_Y = self.buffer.sample(self.probe_size) if len(self.buffer) else (X_new[:0], Y_new[:0])
+        before = self._probe_accuracy(probe_X, probe_Y)
+        saved = [p.copy() for p in self.nn.parameters()]
+        # Скорость оптимизатора не переносится между обновлениями разных примеров
+        self.optimizer.velocity = None
+
+        new_X = np.repeat(X_new, self.new_weight, axis=0)
+        new_Y = np.repeat(Y_new, self.new_weight, axis=0)
+        for _ in range(self.steps):
+            if len(self.buffer):
+                old_X, old_Y = self.buffer.sample(self.replay_size)
+                batch_X, batch_Y = np.vstack([new_X, old_X]), np.vstack([new_Y, old_Y])
+            else:
+                batch_X, batch_Y = new_X, new_Y
+            self.optimizer.step(self.nn.parameters(), self.nn.gradients(batch_X, batch_Y))
+
+        after = self._probe_accuracy(probe_X, probe_Y)
+        rolled_back = after < before - self.tolerance
+        if rolled_back:
+            for p, old in zip(self.nn.parameters(), saved):
+                p[...] = old
+        self.buffer.add(X_new, Y_new)
+        return {'time': time.perf_counter() - start, 'probe_before': before,
+                'probe_after': before if rolled_back else after, 'rolled_back': rolled_back}
@@ -0,0 +1,183 @@
+"""
+Квантованное распознавание: веса int8 с масштабом на слой
+
+Запуск: python quantized.py [число_образов]
+
+Первый слой работает прямо с упакованными битами образа (13 байт на образ):
+биты распаковываются и умножаются на целочисленные веса через float32 BLAS.
+Остальные слои квантуют активации до 8 бит с масштабом по каждому образу
+(метка не зависит от состава пакета) и тоже суммируют произведения целых
+значений через float32 — это точно, пока сумма меньше 2^24. Веса int8
+в 8 раз меньше float64, но для BLAS хранится их копия в float32, поэтому
+в памяти сеть меньше исходной примерно в 1.6 раза.
+
+Вариант table=True считает X·W1 без умножений: для каждой позиции байта
+заранее вычислены суммы строк весов для всех 256 значений байта, и X·W1 —
+это 13 выборок из таблицы и сложений в int16 (int32 для образов больше
+16×16). Таблица в несколько раз больше исходных весов float64, а на
+проверенной машине этот вариант медленнее распаковки с BLAS.
+"""
+import sys
+import time
+
+import numpy as np
+
+from batch_predict import iter_batches
+from neural_network import ACTIVATIONS, load_network
+from storage import open_dataset
+
+INT8_MAX = 127
+
+
+def quantize(W):
+    """Симметричное квантование до int8: W ≈ W_q · scale"""
+    scale = float(np.abs(W).max()) / INT8_MAX or 1.0
+    return np.round(W / scale).astype(np.int8), scale
+
+
+class QuantizedNetwork:
+    """
+    Сеть с весами int8 для массового распознавания двоичных образов.
+
+    table=True — первый слой через таблицу сумм строк вместо распаковки битов
+    (таблица занимает больше памяти, чем веса float64).
+    """
+
+    def __init__(self, nn, table=False):
+        self.input_size = nn.input_size
+        self.row_bytes = -(-nn.input_size // 8)
+        self.activations = [layer.activation for layer in nn.layers]
+        quantized = [quantize(layer.W) for layer in nn.layers]
+        self.weights = [W_q for W_q, _ in quantized]
+        self.scales = [scale for _, scale in quantized]
+        self.biases = [layer.b.astype(np.float32) for layer in nn.layers]
+        self.table = self._first_layer_table(self.weights[0]) if table else None
+        # Целочисленные веса в float32 для точного суммирования через BLAS (копия делается один раз);
+        # первый слой с таблицей в копии не нуждается
+        self.weights_f32 = [W_q.astype(np.float32) for W_q in self.weights]
+        if self.table is not None:
+            self.weights_f32[0] = None
+
+    def _first_layer_table(self, W_q):
+        """table[p, v] — сумма строк W_q для единичных битов значения v байта p (старший бит первый)"""
+        hidden = W_q.shape[1]
+        rows = np.zeros((self.row_bytes * 8, hidden), dtype=np.int16)
+        rows[:self.input_size] = W_q
+        bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(np.int16)  # (256, 8)
+        return np.einsum('vb,pbh->pvh', bits, rows.reshape(self.row_bytes, 8, hidden))  # int16: |сумма| ≤ 8·127
+
+    def first_layer(self, packed):
+        """X·W1 в целых числах по упакованным битам"""
+        if self.table is None:
+            bits = np.unpackbits(packed, axis=1, count=self.input_size).astype(np.float32)
+            return bits @ self.weights_f32[0]
+        # При |X·W1| ≤ input_size·127 < 2^15 (образы до 16×16) хватает int16
+        dtype = np.int16 if self.input_size * INT8_MAX < 2 ** 15 else np.int32
+        acc = np.zeros((packed.shape[0], self.table.shape[2]), dtype=dtype)
+        for p in range(self.row_bytes):
+            acc += self.table[p, packed[:, p]]
+        return acc
+
+    def forward(self, packed):
+        z = self.first_layer(packed).astype(np.float32)
+        z *= self.scales[0]
+        z += self.biases[0]
+        a = ACTIVATIONS[self.activations[0]][0](z)
+        for k, W in enumerate(self.weights_f32[1:], 1):
+            # Масштаб по каждому образу: метка не зависит от других образов пакета
+            a_scale = np.abs(a).max(axis=1, keepdims=True) / INT8_MAX
+            a_scale[a_scale == 0] = 1.0
+            a_q = np.round(a / a_scale)
+            z = a_q @ W
+            z *= a_scale * self.scales[k]
+            z += self.biases[k]
+            a = ACTIVATIONS[self.activations[k]][0](z)
+        return a
+
+    def predict(self, X):
+        """Метки классов; X — упакованные биты (n, row_bytes) или двоичные образы (n, input_size)"""
+        packed = X if X.dtype == np.uint8 and X.shape[1] == self.row_bytes else np.packbits(X != 0, axis=1)
+        return np.argmax(self.forward(packed), axis=1)
+
+    @property
+    def nbytes(self):
+        """Вся занимаемая память: веса int8, их рабочие копии float32, смещения и таблица (если есть)"""
+        return (self.int8_bytes + sum(W.nbytes for W in self.weights_f32 if W is not None)
+                + (self.table.nbytes if self.table is not None else 0))
+
+    @property
+    def int8_bytes(self):
+        """Размер весов int8 и смещений (без рабочих копий)"""
+        return sum(W.nbytes for W in self.weights) + sum(b.nbytes for b in self.biases)
+
+
+def compare(nn, X, y=None, batch_size=4096, repeat=3):
+    """
+    Точность, скорость и полная память квантованных сетей относительно исходной (float64).
+
+    Ключи quantized_* — сеть по умолчанию, table_* — вариант с таблицей первого слоя.
+    """
+    networks = {'quantized': QuantizedNetwork(nn), 'table': QuantizedNetwork(nn, table=True)}
+    packed = np.packbits(X != 0, axis=1)
+
+    def best_time(function):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    def float_predict():
+        # Исходный путь: распаковка битов и прямой проход в float64
+        return np.concatenate([nn.predict(batch) for _, batch in iter_batches(packed, nn.input_size, batch_size)])
+
+    def quantized_predict(network):
+        return np.concatenate([network.predict(packed[i:i + batch_size]) for i in range(0, len(packed), batch_size)])
+
+    float_time, float_labels = best_time(float_predict)
+    float_bytes = sum(layer.W.nbytes + layer.b.nbytes for layer in nn.layers)
+    result = {'float_rate': len(X) / float_time, 'float_bytes': float_bytes}
+    if y is not None:
+        result['float_accuracy'] = float(np.mean(float_labels == y))
+    for name, network in networks.items():
+        quant_time, labels = best_time(lambda: quantized_predict(network))
+        result[f'{name}_agreement'] = float(np.mean(float_labels == labels))
+        result[f'{name}_rate'] = len(X) / quant_time
+        result[f'{name}_speedup'] = float_time / quant_time
+        # Полная память, включая рабочие копии float32 и таблицу первого слоя
+        result[f'{name}_bytes'] = network.nbytes
+        result[f'{name}_memory_ratio'] = float_bytes / network.nbytes
+        result[f'{name}_int8_bytes'] = network.int8_bytes
+        if y is not None:
+            result[f'{name}_accuracy'] = float(np.mean(labels == y))
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    nn = load_network()
+    samples, labels = open_dataset(input_size=nn.input_size).arrays()
+    if not len(labels):
+        sys.exit("Обучающая выборка пуста.")
+    rng = np.random.default_rng(0)
+    idx = rng.integers(0, len(labels), n)
+    X = np.abs(samples[idx].astype(np.float64) - (rng.random((n, samples.shape[1])) < 0.03))
+    y = labels[idx].astype(np.int64)
+
+    r = compare(nn, X, y)
+    print(f"Образов: {n}")
+    print(f"Веса float64: {r['float_bytes'] / 1024:.1f} КБ, точность {r['float_accuracy']:.4f}, "
+          f"{r['float_rate']:,.0f} образов/с")
+    for name, title in (('quantized', 'int8'), ('table', 'int8 с таблицей первого слоя')):
+        ratio = r[f'{name}_memory_ratio']
+        memory = f"в {ratio:.1f} раза меньше" if ratio >= 1 else f"в {1 / ratio:.1f} раза больше"
+        print(f"{title}: память {r[f'{name}_bytes'] / 1024:.1f} КБ ({memory}; "
+              f"из них веса int8 {r[f'{name}_int8_bytes'] / 1024:.1f} КБ), "
+              f"точность {r[f'{name}_accuracy']:.4f} ({r[f'{name}_accuracy'] - r['float_accuracy']:+.4f}), "
+              f"совпадение меток {r[f'{name}_agreement']:.4f}, "
+              f"{r[f'{name}_rate']:,.0f} образов/с (ускорение {r[f'{name}_speedup']:.2f}×)")
+
+
+if __name__ == "__main__":
+    main()
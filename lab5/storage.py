@@ -0,0 +1,163 @@
+import json
+import os
+import pickle
+
+import numpy as np
+
+# Файлы хранятся рядом с модулем, а не в текущем каталоге
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WEIGHTS_PATH = os.path.join(BASE_DIR, 'weights.bin')
+DATASET_PATH = os.path.join(BASE_DIR, 'dataset.bin')
+
+# Формат файла: строка-заголовок JSON (дополненная пробелами до границы
+# HEADER_ALIGN байт), далее сырые массивы без разделителей
+FORMAT_VERSION = 1
+WEIGHTS_FORMAT = 'lab5-weights'
+DATASET_FORMAT = 'lab5-dataset'
+HEADER_ALIGN = 64
+
+
+def write_header(f, header):
+    """Записывает заголовок так, чтобы данные начинались с выровненного смещения"""
+    line = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    size = -(-(len(line) + 1) // HEADER_ALIGN) * HEADER_ALIGN
+    f.write(line + b' ' * (size - len(line) - 1) + b'\n')
+
+
+def read_header(path, expected_format):
+    """Читает и проверяет заголовок; возвращает его и смещение данных"""
+    with open(path, 'rb') as f:
+        line = f.readline()
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get('format') != expected_format:
+        raise ValueError(f"Файл '{path}' не является файлом формата {expected_format}")
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла '{path}': {header.get('version')}")
+    return header, len(line)
+
+
+def save_arrays(path, expected_format, arrays, **fields):
+    """Сохраняет массивы float64 одним файлом; замена файла атомарна"""
+    arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in arrays]
+    header = {'format': expected_format, 'version': FORMAT_VERSION, 'dtype': 'float64',
+              'shapes': [list(a.shape) for a in arrays], **fields}
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        write_header(f, header)
+        for a in arrays:
+            f.write(a.tobytes())
+    os.replace(tmp, path)
+
+
+def load_arrays(path, expected_format, mode='c'):
+    """
+    Загружает массивы отображением файла в память.
+
+    mode='c' (копирование при записи) позволяет дообучать загруженные веса,
+    не изменяя файл; mode='r' — только чтение.
+    """
+    header, offset = read_header(path, expected_format)
+    shapes = [tuple(shape) for shape in header['shapes']]
+    total = sum(int(np.prod(shape)) for shape in shapes)
+    itemsize = np.dtype(header['dtype']).itemsize
+    if os.path.getsize(path) - offset != total * itemsize:
+        raise ValueError(f"Размер данных файла '{path}' не соответствует заголовку")
+    flat = np.memmap(path, dtype=header['dtype'], mode=mode, offset=offset, shape=(total,))
+    arrays, start = [], 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        arrays.append(flat[start:start + size].reshape(shape))
+        start += size
+    return header, arrays
+
+
+class SampleStore:
+    """
+    Обучающая выборка в файле только для дозаписи.
+
+    Пример — запись фиксированной длины: input_size байт пикселей и байт метки.
+    Добавление дописывает одну запись (O(1) по размеру выборки); чтение
+    отображает файл в память. Неполная последняя запись (прерванная
+    дозапись) игнорируется.
+    """
+
+    def __init__(self, path=DATASET_PATH, input_size=100):
+        self.path = path
+        self.input_size = input_size
+        self.record = np.dtype([('x', np.uint8, (input_size,)), ('y', np.uint8)])
+        if not os.path.exists(path):
+            self._rewrite(np.zeros(0, dtype=self.record))
+        header, self.offset = read_header(path, DATASET_FORMAT)
+        if header['input_size'] != input_size:
+            raise ValueError(f"Размер примера в файле {header['input_size']}, ожидается {input_size}")
+
+    def _records(self, X, y):
+        records = np.zeros(len(y), dtype=self.record)
+        records['x'] = np.asarray(X).reshape(len(y), self.input_size) != 0
+        records['y'] = y
+        return records
+
+    def _rewrite(self, records):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            write_header(f, {'format': DATASET_FORMAT, 'version': FORMAT_VERSION,
+                             'input_size': self.input_size, 'dtype': 'uint8'})
+            f.write(records.tobytes())
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return (os.path.getsize(self.path) - self.offset) // self.record.itemsize
+
+    def append(self, x, y):
+        """Дописывает пример (x — двоичные пиксели, y — номер класса)"""
+        self.extend(np.asarray(x).reshape(1, -1), [y])
+
+    def extend(self, X, y):
+        """Дописывает пакет примеров"""
+        records = self._records(X, y)
+        with open(self.path, 'r+b') as f:
+            # Дозапись после последней полной записи
+            f.seek(self.offset + len(self) * self.record.itemsize)
+            f.write(records.tobytes())
+            f.truncate()
+
+    def arrays(self):
+        """Пиксели (n, input_size) и метки (n,) — отображения файла только для чтения"""
+        n = len(self)
+        if n == 0:
+            return np.zeros((0, self.input_size), dtype=np.uint8), np.zeros(0, dtype=np.uint8)
+        records = np.memmap(self.path, dtype=self.record, mode='r', offset=self.offset, shape=(n,))
+        return records['x'], records['y']
+
+    def delete(self, index):
+        """Удаляет пример; единственная операция, перезаписывающая файл"""
+        X, y = self.arrays()
+        keep = np.arange(len(y)) != index
+        records = self._records(X[keep], y[keep])
+        # Отображение закрывается до замены файла
+        del X, y
+        self._rewrite(records)
+
+
+def import_pickle_dataset(pickle_path, store):
+    """Однократный перенос выборки из старого формата (список пар в pickle)"""
+    with open(pickle_path, 'rb') as f:
+        dataset = pickle.load(f)
+    if dataset:
+        store.extend(np.array([x for x, _ in dataset]), [y for _, y in dataset])
+    return len(dataset)
+
+
+def open_dataset(path=DATASET_PATH, input_size=100):
+    """Выборка по умолчанию; при первом запуске переносится из старого dataset.pkl"""
+    # Перенос выполняется, только пока файл выборки не создан: выборка,
+    # очищенная пользователем, не должна заполняться старыми примерами
+    migrate = not os.path.exists(path)
+    store = SampleStore(path, input_size)
+    legacy = os.path.join(BASE_DIR, 'dataset.pkl')
+    if migrate and os.path.exists(legacy):
+        import_pickle_dataset(legacy, store)
+    return store
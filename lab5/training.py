@@ -0,0 +1,253 @@
+import numpy as np
+
+from augmentation import augmented_batches
+
+
+class SGD:
+    """Стохастический градиентный спуск с моментом (momentum=0 — обычный спуск)"""
+
+    def __init__(self, lr=0.1, momentum=0.9):
+        self.lr = lr
+        self.momentum = momentum
+        self.velocity = None
+
+    def step(self, params, grads):
+        """Обновление параметров на месте"""
+        if self.velocity is None:
+            self.velocity = [np.zeros_like(p) for p in params]
+        for p, g, v in zip(params, grads, self.velocity):
+            v *= self.momentum
+            v -= self.lr * g
+            p += v
+
+
+class Adam:
+    """Адаптивный оптимизатор Adam"""
+
+    def __init__(self, lr=0.001, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.lr = lr
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.t = 0
+        self.m = None
+        self.v = None
+
+    def step(self, params, grads):
+        """Обновление параметров на месте"""
+        if self.m is None:
+            self.m = [np.zeros_like(p) for p in params]
+            self.v = [np.zeros_like(p) for p in params]
+        self.t += 1
+        # Поправка на смещение первых шагов учитывается в шаге обучения
+        lr = self.lr * np.sqrt(1 - self.beta2 ** self.t) / (1 - self.beta1 ** self.t)
+        for p, g, m, v in zip(params, grads, self.m, self.v):
+            m *= self.beta1
+            m += (1 - self.beta1) * g
+            v *= self.beta2
+            v += (1 - self.beta2) * g * g
+            p -= lr * m / (np.sqrt(v) + self.eps)
+
+
+def loss(nn, X, y):
+    """Средняя ошибка сети: перекрёстная энтропия для softmax, иначе квадратичная"""
+    output = nn.forward(X)
+    if nn.output_activation == 'softmax':
+        return float(-np.sum(y * np.log(np.clip(output, 1e-12, 1.0))) / X.shape[0])
+    return float(np.sum((output - y) ** 2) / (2 * X.shape[0]))
+
+
+def accuracy(nn, X, y):
+    """Доля правильно распознанных примеров (y — one-hot)"""
+    return float(np.mean(nn.predict(X) == np.argmax(y, axis=1)))
+
+
+def train(nn, X, y, epochs=500, batch_size=32, optimizer=None, validation=None,
+          validation_split=0.0, patience=20, min_delta=1e-4, seed=None, augment=None):
+    """
+    Обучение перемешанными мини-пакетами с ранней остановкой.
+
+    validation: пара (X, y) для контроля; иначе от обучающей выборки
+    отделяется доля validation_split. Без контрольной выборки остановка
+    выполняется по ошибке на обучающей выборке. Если ошибка не уменьшается
+    на min_delta за patience эпох, обучение прекращается и сети
+    возвращаются лучшие веса.
+
+    augment: параметры augmentation.augment (или True — по умолчанию);
+    тогда пакеты заменяются случайными вариантами образов, а ошибка
+    по-прежнему считается на исходных образах.
+
+    Возвращает историю: ошибки по эпохам, точность на контроле, число эпох
+    и признак ранней остановки.
+    """
+    rng = np.random.default_rng(seed)
+    optimizer = optimizer or Adam(lr=0.01)
+    if validation is None and validation_split > 0:
+        order = rng.permutation(X.shape[0])
+        n_val = max(1, int(X.shape[0] * validation_split))
+        validation = (X[order[:n_val]], y[order[:n_val]])
+        X, y = X[order[n_val:]], y[order[n_val:]]
+
+    history = {'loss': [], 'val_loss': [], 'val_accuracy': [], 'epochs': 0, 'stopped_early': False}
+    best_loss = np.inf
+    best_params = [p.copy() for p in nn.parameters()]
+    waited = 0
+    n = X.shape[0]
+    for epoch in range(epochs):
+        if augment:
+            params = augment if isinstance(augment, dict) else {}
+            batches = augmented_batches(X, y, batch_size, rng, **params)
+        else:
+            order = rng.permutation(n)
+            batches = ((X[order[i:i + batch_size]], y[order[i:i + batch_size]]) for i in range(0, n, batch_size))
+        for X_batch, y_batch in batches:
+            optimizer.step(nn.parameters(), nn.gradients(X_batch, y_batch))
+
+        history['loss'].append(loss(nn, X, y))
+        if validation is not None:
+            history['val_loss'].append(loss(nn, *validation))
+            history['val_accuracy'].append(accuracy(nn, *validation))
+            monitored = history['val_loss'][-1]
+        else:
+            monitored = history['loss'][-1]
+        history['epochs'] = epoch + 1
+
+        if monitored < best_loss - min_delta:
+            best_loss = monitored
+            best_params = [p.copy() for p in nn.parameters()]
+            waited = 0
+        else:
+            waited += 1
+            if waited >= patience:
+                history['stopped_early'] = True
+                break
+
+    for p, best in zip(nn.parameters(), best_params):
+        p[...] = best
+    return history
+
+
+class BufferedTrainer:
+    """
+    Обучение без выделения памяти в цикле эпох.
+
+    Все промежуточные массивы (активации, дельты, градиенты, скорости) создаются
+    один раз под размер пакета и тип dtype; прямой и обратный проходы выполняются
+    ufunc-операциями с out=, обновление весов с моментом — на месте.
+    Сеть обучается на копиях весов в dtype; export() возвращает их в сеть.
+    """
+
+    def __init__(self, nn, batch_size=32, dtype=np.float32, lr=0.1, momentum=0.9):
+        self.nn = nn
+        self.batch_size = batch_size
+        self.dtype = np.dtype(dtype)
+        self.lr = lr
+        self.momentum = momentum
+        self.layer_activations = [layer.activation for layer in nn.layers]
+
+        self.weights = [np.array(layer.W, dtype=dtype) for layer in nn.layers]
+        self.biases = [np.array(layer.b, dtype=dtype) for layer in nn.layers]
+        sizes = nn.layer_sizes
+        B = batch_size
+        # activations[0] — входной пакет, activations[k] — выход k-го слоя
+        self.activations = [np.empty((B, size), dtype=dtype) for size in sizes]
+        self.deltas = [np.empty((B, size), dtype=dtype) for size in sizes[1:]]
+        self.scratch = [np.empty((B, size), dtype=dtype) for size in sizes[1:]]
+        self.targets = np.empty((B, nn.output_size), dtype=dtype)
+        self.row = np.empty((B, 1), dtype=dtype)
+        self.grad_W = [np.empty_like(W) for W in self.weights]
+        self.grad_b = [np.empty_like(b) for b in self.biases]
+        self.vel_W = [np.zeros_like(W) for W in self.weights]
+        self.vel_b = [np.zeros_like(b) for b in self.biases]
+
+    def _activate_inplace(self, z, activation, n):
+        if activation == 'sigmoid':
+            np.clip(z, -50, 50, out=z)
+            np.negative(z, out=z)
+            np.exp(z, out=z)
+            z += 1
+            np.reciprocal(z, out=z)
+        elif activation == 'tanh':
+            np.tanh(z, out=z)
+        elif activation == 'relu':
+            np.maximum(z, 0, out=z)
+        else:
+            row = self.row[:n]
+            np.max(z, axis=1, keepdims=True, out=row)
+            z -= row
+            np.exp(z, out=z)
+            np.sum(z, axis=1, keepdims=True, out=row)
+            z /= row
+
+    @staticmethod
+    def _derivative_into(a, activation, out):
+        """Производная активации по её выходу a, записанная в out"""
+        if activation == 'sigmoid':
+            np.subtract(1, a, out=out)
+            out *= a
+        elif activation == 'tanh':
+            np.multiply(a, a, out=out)
+            np.subtract(1, out, out=out)
+        else:
+            np.greater(a, 0, out=out)
+
+    def _forward(self, n):
+        for k, (W, b) in enumerate(zip(self.weights, self.biases)):
+            z = self.activations[k + 1][:n]
+            np.dot(self.activations[k][:n], W, out=z)
+            z += b
+            self._activate_inplace(z, self.layer_activations[k], n)
+
+    def _backward_update(self, n):
+        last = len(self.weights) - 1
+        delta = self.deltas[last][:n]
+        output = self.activations[last + 1][:n]
+        np.subtract(output, self.targets[:n], out=delta)
+        if self.layer_activations[last] != 'softmax':
+            derivative = self.scratch[last][:n]
+            self._derivative_into(output, self.layer_activations[last], derivative)
+            delta *= derivative
+        delta *= 1.0 / n
+
+        for k in range(last, -1, -1):
+            delta = self.deltas[k][:n]
+            np.dot(self.activations[k][:n].T, delta, out=self.grad_W[k])
+            np.sum(delta, axis=0, keepdims=True, out=self.grad_b[k])
+            if k > 0:
+                # Дельта предыдущего слоя считается до обновления весов
+                previous = self.deltas[k - 1][:n]
+                np.dot(delta, self.weights[k].T, out=previous)
+                derivative = self.scratch[k - 1][:n]
+                self._derivative_into(self.activations[k][:n], self.layer_activations[k - 1], derivative)
+                previous *= derivative
+            for param, grad, vel in ((self.weights[k], self.grad_W[k], self.vel_W[k]),
+                                     (self.biases[k], self.grad_b[k], self.vel_b[k])):
+                grad *= self.lr
+                vel *= self.momentum
+                vel -= grad
+                param += vel
+
+    def fit(self, X, y, epochs=100, seed=None):
+        """Обучение перемешанными пакетами размера batch_size; возвращает сеть с новыми весами"""
+        rng = np.random.default_rng(seed)
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        y = np.ascontiguousarray(y, dtype=self.dtype)
+        n_samples = X.shape[0]
+        order = np.arange(n_samples)
+        for _ in range(epochs):
+            rng.shuffle(order)
+            for start in range(0, n_samples, self.batch_size):
+                batch = order[start:start + self.batch_size]
+                n = batch.shape[0]
+                np.take(X, batch, axis=0, out=self.activations[0][:n], mode='clip')
+                np.take(y, batch, axis=0, out=self.targets[:n], mode='clip')
+                self._forward(n)
+                self._backward_update(n)
+        return self.export()
+
+    def export(self):
+        """Копирует обученные веса в сеть (в её типе float64)"""
+        for layer, W, b in zip(self.nn.layers, self.weights, self.biases):
+            layer.W = W.astype(np.float64)
+            layer.b = b.astype(np.float64)
+        return self.nn